@@ -0,0 +1,150 @@
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from app.config import JOBS_DB, JOBS_DIR, JOB_WORKERS
+from app.extraction.extractor import extract_text
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    file_name TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    pages_done INTEGER NOT NULL DEFAULT 0,
+    pages_total INTEGER,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+class JobStore:
+    """SQLite-backed job table, safe to share across worker threads."""
+
+    def __init__(self, db_path: Path = JOBS_DB):
+        self.db_path = db_path
+        with self._connect() as conn:
+            conn.execute(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def create(self, file_name: str, file_path: Path, job_id: str) -> dict:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, file_name, file_path, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, file_name, str(file_path), now, now),
+            )
+        return self.get(job_id)
+
+    def update(self, job_id: str, **fields) -> None:
+        fields["updated_at"] = time.time()
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+
+    def get(self, job_id: str) -> dict | None:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def pending(self) -> list[str]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id FROM jobs WHERE status IN (?, ?) ORDER BY created_at", (QUEUED, RUNNING)
+            ).fetchall()
+        return [row["id"] for row in rows]
+
+
+class JobQueue:
+    """Runs queued extraction jobs on local worker threads and records progress in a JobStore."""
+
+    def __init__(self, store: JobStore, workers: int = JOB_WORKERS):
+        self.store = store
+        self.workers = max(1, workers)
+        self._queue = queue.Queue()
+        self._threads = []
+
+    def start(self) -> None:
+        pending = self.store.pending()
+        if pending:
+            logger.info(f"Resuming {len(pending)} unfinished jobs")
+        for job_id in pending:
+            self.store.update(job_id, status=QUEUED)
+            self._queue.put(job_id)
+
+        self._threads = [
+            threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout=1)
+
+    def submit(self, file_name: str, file_path: Path, job_id: str) -> dict:
+        job = self.store.create(file_name, file_path, job_id)
+        self._queue.put(job_id)
+        return job
+
+    def _work(self) -> None:
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                return
+            self._run(job_id)
+
+    def _run(self, job_id: str) -> None:
+        job = self.store.get(job_id)
+        if not job or job["status"] not in (QUEUED, RUNNING):
+            return
+
+        file_path = Path(job["file_path"])
+        self.store.update(job_id, status=RUNNING)
+
+        def progress(done: int, total: int) -> None:
+            self.store.update(job_id, pages_done=done, pages_total=total)
+
+        try:
+            result = extract_text(file_path, progress=progress)
+            result["file_name"] = job["file_name"]
+            self.store.update(
+                job_id,
+                status=DONE,
+                pages_done=result.get("page_count") or 0,
+                pages_total=result.get("page_count"),
+                result=json.dumps(result, ensure_ascii=False),
+            )
+            logger.info(f"Job {job_id} finished for {job['file_name']}")
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}")
+            self.store.update(job_id, status=FAILED, error=str(e))
+        finally:
+            file_path.unlink(missing_ok=True)
+
+
+def new_job_path(suffix: str) -> tuple[str, Path]:
+    job_id = uuid.uuid4().hex
+    return job_id, JOBS_DIR / f"{job_id}{suffix}"
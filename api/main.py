@@ -1,17 +1,80 @@
+import asyncio
+import json
+import multiprocessing
 import shutil
 import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from functools import partial
 from pathlib import Path
+from typing import Iterator
+import httpx
 from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 
-from app.config import RAW_DIR, PROCESSED_DIR
-from app.ingestion.downloader import download_pdf
-from app.extraction.extractor import extract_text, get_supported_extensions
+from app.config import (
+    RAW_DIR,
+    PROCESSED_DIR,
+    API_WORKERS,
+    BATCH_WORKERS,
+    BATCH_CONCURRENCY,
+    DOWNLOAD_CACHE_ENABLED,
+    UPLOAD_SPOOL_MAX_BYTES,
+)
+from app.ingestion.downloader import download_pdf_async
+from app.ingestion.download_cache import DownloadCache
+from app.extraction.extractor import extract_text, extract_text_from_buffer, get_supported_extensions
+from app.extraction.cache import get_cache_stats
+from app.extraction.ocr import limit_ocr_workers
+from app.extraction.pages import iter_pages, page_count, parse_page_ranges
 from app.export.exporter import export_to_json, export_to_csv
+from app.metrics import merge, render, run_collecting
+from api.jobs import JobQueue, JobStore, DONE, FAILED, new_job_path
+
+
+_batch_pool_lock = threading.Lock()
+
+
+def new_batch_pool(workers: int = BATCH_WORKERS) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        # Batch workers each extract one upload; OCR stays in-process instead of nesting a pool per document
+        initializer=limit_ocr_workers,
+    )
 
-app = FastAPI(title="Document Extraction API")
+
+def replace_batch_pool(broken: ProcessPoolExecutor) -> None:
+    """Swap in a fresh batch pool, unless another request already replaced `broken`."""
+    with _batch_pool_lock:
+        if app.state.batch_pool is broken:
+            broken.shutdown(wait=False, cancel_futures=True)
+            app.state.batch_pool = new_batch_pool()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.executor = ThreadPoolExecutor(max_workers=API_WORKERS, thread_name_prefix="extract")
+    app.state.http = httpx.AsyncClient(follow_redirects=True)
+    app.state.download_cache = DownloadCache() if DOWNLOAD_CACHE_ENABLED else None
+    app.state.batch_pool = new_batch_pool()
+    app.state.batch_retry_lock = asyncio.Lock()
+    app.state.jobs = JobQueue(JobStore())
+    app.state.jobs.start()
+    try:
+        yield
+    finally:
+        app.state.jobs.stop()
+        app.state.batch_pool.shutdown(wait=False, cancel_futures=True)
+        await app.state.http.aclose()
+        app.state.executor.shutdown(wait=False, cancel_futures=True)
+
+
+app = FastAPI(title="Document Extraction API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -26,12 +89,103 @@ class URLRequest(BaseModel):
     url: str
 
 
+class PageText(BaseModel):
+    page_number: int
+    extraction_method: str | None
+    start: int
+    end: int
+    text: str | None = None
+
+
 class ExtractionResult(BaseModel):
     file_name: str
     page_count: int | None
     extraction_method: str | None
     extracted_text: str | None
     success: bool
+    error: str | None = None
+    pages: list[PageText] | None = None
+
+
+def iter_ndjson(result: dict, page_numbers: list[int] | None) -> Iterator[bytes]:
+    summary = {key: result.get(key) for key in ("file_name", "page_count", "extraction_method", "success", "error")}
+    yield json.dumps(summary, ensure_ascii=False).encode() + b"\n"
+    for page in iter_pages(result, page_numbers):
+        yield json.dumps(page.to_dict(), ensure_ascii=False).encode() + b"\n"
+
+
+def extraction_response(result: dict, pages: str | None = None, stream: bool = False):
+    """Full text with page offsets by default; only the `pages` ranges, with their text, when given."""
+    page_numbers = None
+    if pages:
+        try:
+            page_numbers = parse_page_ranges(pages, page_count(result))
+        except ValueError as e:
+            raise HTTPException(400, str(e))
+
+    if stream:
+        return StreamingResponse(iter_ndjson(result, page_numbers), media_type="application/x-ndjson")
+
+    fields = {key: result.get(key) for key in ("file_name", "page_count", "extraction_method", "success", "error")}
+    if page_numbers is None:
+        page_list = [PageText(**{**page.to_dict(), "text": None}) for page in iter_pages(result)]
+        return ExtractionResult(**fields, extracted_text=result.get("extracted_text"), pages=page_list or None)
+    page_list = [PageText(**page.to_dict()) for page in iter_pages(result, page_numbers)]
+    return ExtractionResult(**fields, extracted_text=None, pages=page_list)
+
+
+async def run_blocking(func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(app.state.executor, partial(func, *args, **kwargs))
+
+
+class JobStatus(BaseModel):
+    job_id: str
+    status: str
+    file_name: str
+    pages_done: int
+    pages_total: int | None
+    error: str | None
+    created_at: float
+    updated_at: float
+
+
+def job_status(job: dict) -> JobStatus:
+    return JobStatus(job_id=job["id"], **{k: job[k] for k in JobStatus.model_fields if k != "job_id"})
+
+
+def save_upload_to(file: UploadFile, destination: Path) -> Path:
+    with open(destination, "wb") as f:
+        shutil.copyfileobj(file.file, f)
+    return destination
+
+
+def spool_upload(file: UploadFile, suffix: str, max_bytes: int = UPLOAD_SPOOL_MAX_BYTES) -> bytes | Path:
+    """Return small uploads as bytes; spill anything over `max_bytes` to a temp file."""
+    data = file.file.read(max_bytes + 1)
+    if len(data) <= max_bytes:
+        return data
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+        tmp.write(data)
+        del data
+        shutil.copyfileobj(file.file, tmp)
+        return Path(tmp.name)
+
+
+def extract_spooled(upload: bytes | Path, file_name: str) -> dict:
+    if isinstance(upload, bytes):
+        return extract_text_from_buffer(upload, file_name)
+    try:
+        result = extract_text(upload)
+    finally:
+        upload.unlink(missing_ok=True)
+    result["file_name"] = file_name
+    return result
+
+
+def extract_upload(file: UploadFile, suffix: str) -> dict:
+    return extract_spooled(spool_upload(file, suffix), file.filename)
 
 
 @app.get("/health")
@@ -44,69 +198,99 @@ def supported_formats():
     return {"extensions": get_supported_extensions()}
 
 
+@app.get("/cache/stats")
+def cache_stats():
+    return get_cache_stats()
+
+
+@app.get("/metrics")
+def metrics():
+    return PlainTextResponse(render(), media_type="text/plain; version=0.0.4")
+
+
 @app.post("/extract/file", response_model=ExtractionResult)
-async def extract_from_file(file: UploadFile = File(...)):
+async def extract_from_file(file: UploadFile = File(...), pages: str | None = None, stream: bool = False):
     suffix = Path(file.filename).suffix.lower()
     supported = get_supported_extensions()
 
     if suffix not in supported:
         raise HTTPException(400, f"Unsupported format. Supported: {supported}")
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-        shutil.copyfileobj(file.file, tmp)
-        tmp_path = Path(tmp.name)
-
-    try:
-        result = extract_text(tmp_path)
-        return ExtractionResult(**result)
-    finally:
-        tmp_path.unlink(missing_ok=True)
+    result = await run_blocking(extract_upload, file, suffix)
+    return extraction_response(result, pages, stream)
 
 
 @app.post("/extract/url", response_model=ExtractionResult)
-async def extract_from_url(request: URLRequest):
-    file_path = download_pdf(request.url)
+async def extract_from_url(request: URLRequest, pages: str | None = None, stream: bool = False):
+    file_path = await download_pdf_async(request.url, client=app.state.http, cache=app.state.download_cache)
     if not file_path:
         raise HTTPException(400, "Failed to download file")
 
-    result = extract_text(file_path)
+    result = await run_blocking(extract_text, file_path)
     result["source_url"] = request.url
-    return ExtractionResult(**result)
+    return extraction_response(result, pages, stream)
 
 
-@app.post("/extract/batch")
-async def extract_batch(files: list[UploadFile] = File(...)):
-    results = []
-    supported = get_supported_extensions()
+async def run_in_batch_pool(*call) -> tuple[dict, dict]:
+    """Run `call` in the batch pool, replacing the pool if one of its workers has died.
 
-    for file in files:
-        suffix = Path(file.filename).suffix.lower()
-        if suffix not in supported:
-            results.append({
-                "file_name": file.filename,
-                "success": False,
-                "error": "Unsupported format",
-            })
-            continue
+    Every file in flight when a worker dies sees the pool break, so each is retried alone in a
+    one-worker pool; only a file that kills its worker again fails.
+    """
+    loop = asyncio.get_running_loop()
+    pool = app.state.batch_pool
+    try:
+        return await loop.run_in_executor(pool, run_collecting, *call)
+    except BrokenProcessPool:
+        replace_batch_pool(pool)
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            shutil.copyfileobj(file.file, tmp)
-            tmp_path = Path(tmp.name)
+    async with app.state.batch_retry_lock:
+        isolated = new_batch_pool(1)
+        try:
+            return await loop.run_in_executor(isolated, run_collecting, *call)
+        finally:
+            isolated.shutdown(wait=False)
 
+
+async def extract_batch_item(file: UploadFile, limit: asyncio.Semaphore) -> dict:
+    suffix = Path(file.filename).suffix.lower()
+    if suffix not in get_supported_extensions():
+        return {
+            "file_name": file.filename,
+            "success": False,
+            "error": "Unsupported format",
+        }
+
+    async with limit:
+        upload = await run_blocking(spool_upload, file, suffix)
         try:
-            result = extract_text(tmp_path)
-            results.append(result)
+            if isinstance(upload, bytes):
+                call = (extract_text_from_buffer, upload, file.filename)
+            else:
+                call = (extract_text, upload)
+            result, snapshot = await run_in_batch_pool(*call)
+            merge(snapshot)
+            result["file_name"] = file.filename
+            return result
+        except Exception as e:
+            return {"file_name": file.filename, "success": False, "error": str(e)}
         finally:
-            tmp_path.unlink(missing_ok=True)
+            if isinstance(upload, Path):
+                upload.unlink(missing_ok=True)
 
-    return {"results": results, "total": len(results)}
+
+@app.post("/extract/batch")
+async def extract_batch(files: list[UploadFile] = File(...)):
+    limit = asyncio.Semaphore(BATCH_CONCURRENCY)
+    results = await asyncio.gather(*(extract_batch_item(file, limit) for file in files))
+    return {"results": list(results), "total": len(results)}
 
 
 @app.post("/export/json")
 async def export_json(files: list[UploadFile] = File(...)):
     batch_result = await extract_batch(files)
     records = batch_result["results"]
-    output_path = export_to_json(records)
+    output_path = await run_blocking(export_to_json, records)
     return FileResponse(output_path, filename=output_path.name, media_type="application/json")
 
 
@@ -114,5 +298,39 @@ async def export_json(files: list[UploadFile] = File(...)):
 async def export_csv(files: list[UploadFile] = File(...)):
     batch_result = await extract_batch(files)
     records = batch_result["results"]
-    output_path = export_to_csv(records)
-    return FileResponse(output_path, filename=output_path.name, media_type="text/csv")
\ No newline at end of file
+    output_path = await run_blocking(export_to_csv, records)
+    return FileResponse(output_path, filename=output_path.name, media_type="text/csv")
+
+
+@app.post("/jobs", response_model=JobStatus, status_code=202)
+async def submit_job(file: UploadFile = File(...)):
+    suffix = Path(file.filename).suffix.lower()
+    supported = get_supported_extensions()
+
+    if suffix not in supported:
+        raise HTTPException(400, f"Unsupported format. Supported: {supported}")
+
+    job_id, job_path = new_job_path(suffix)
+    await run_blocking(save_upload_to, file, job_path)
+    job = await run_blocking(app.state.jobs.submit, file.filename, job_path, job_id)
+    return job_status(job)
+
+
+@app.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    job = await run_blocking(app.state.jobs.store.get, job_id)
+    if not job:
+        raise HTTPException(404, "Job not found")
+    return job_status(job)
+
+
+@app.get("/jobs/{job_id}/result", response_model=ExtractionResult)
+async def get_job_result(job_id: str, pages: str | None = None, stream: bool = False):
+    job = await run_blocking(app.state.jobs.store.get, job_id)
+    if not job:
+        raise HTTPException(404, "Job not found")
+    if job["status"] == FAILED:
+        raise HTTPException(500, f"Job failed: {job['error']}")
+    if job["status"] != DONE:
+        raise HTTPException(409, f"Job is {job['status']}")
+    return extraction_response(json.loads(job["result"]), pages, stream)
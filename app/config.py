@@ -8,14 +8,62 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 DATA_DIR = BASE_DIR / "data"
 RAW_DIR = DATA_DIR / "raw"
 PROCESSED_DIR = DATA_DIR / "processed"
+CACHE_DIR = DATA_DIR / "cache"
+JOBS_DIR = DATA_DIR / "jobs"
+JOBS_DB = DATA_DIR / "jobs.db"
+MANIFEST_DB = DATA_DIR / "manifest.db"
+DOWNLOAD_CACHE_DB = DATA_DIR / "downloads.db"
+RESULTS_DIR = DATA_DIR / "results"
 LOGS_DIR = BASE_DIR / "logs"
 
 DOWNLOAD_TIMEOUT = int(os.getenv("DOWNLOAD_TIMEOUT", 30))
 MAX_RETRIES = int(os.getenv("MAX_RETRIES", 3))
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+DOWNLOAD_WORKERS = int(os.getenv("DOWNLOAD_WORKERS", 8))
+DOWNLOAD_PER_HOST = int(os.getenv("DOWNLOAD_PER_HOST", 4))
+CRAWL_WORKERS = int(os.getenv("CRAWL_WORKERS", 8))
+CRAWL_DELAY = float(os.getenv("CRAWL_DELAY", 1.0))
+CRAWL_MAX_PAGES = int(os.getenv("CRAWL_MAX_PAGES", 1000))
+DOWNLOAD_CACHE_ENABLED = os.getenv("DOWNLOAD_CACHE_ENABLED", "true").lower() == "true"
+
+MAX_FILE_BYTES = int(os.getenv("MAX_FILE_MB", 500)) * 1024 * 1024
+# TXT files are read in chunks, so they get their own limit
+MAX_TXT_BYTES = int(os.getenv("MAX_TXT_MB", 0)) * 1024 * 1024
+EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", os.cpu_count() or 1))
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", 32))
+
+API_WORKERS = int(os.getenv("API_WORKERS", 4))
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", os.cpu_count() or 1))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", 4))
+UPLOAD_SPOOL_MAX_BYTES = int(os.getenv("UPLOAD_SPOOL_MB", 8)) * 1024 * 1024
+
+EXPORT_FLUSH_EVERY = int(os.getenv("EXPORT_FLUSH_EVERY", 100))
+EXPORT_ROTATE_RECORDS = int(os.getenv("EXPORT_ROTATE_RECORDS", 0))
+EXPORT_ROTATE_BYTES = int(os.getenv("EXPORT_ROTATE_MB", 0)) * 1024 * 1024
+PARQUET_COMPRESSION = os.getenv("PARQUET_COMPRESSION", "zstd")
+PARQUET_ROW_GROUP_SIZE = int(os.getenv("PARQUET_ROW_GROUP_SIZE", 1000))
+
+OCR_DPI = int(os.getenv("OCR_DPI", 200))
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", os.cpu_count() or 1))
+OCR_PAGES_PER_TASK = int(os.getenv("OCR_PAGES_PER_TASK", 8))
+OCR_WINDOW_SIZE = int(os.getenv("OCR_WINDOW_SIZE", 2))
+OCR_ENGINE = os.getenv("OCR_ENGINE", "auto")
+OCR_LANG = os.getenv("OCR_LANG", "eng")
+OCR_TARGET_DPI = int(os.getenv("OCR_TARGET_DPI", 300))
+OCR_BINARIZE = os.getenv("OCR_BINARIZE", "false").lower() == "true"
+
+DOCX_PARSER = os.getenv("DOCX_PARSER", "stream")
+
+TXT_SNIFF_BYTES = int(os.getenv("TXT_SNIFF_KB", 64)) * 1024
+TXT_CHUNK_BYTES = int(os.getenv("TXT_CHUNK_KB", 1024)) * 1024
+TXT_MMAP_BYTES = int(os.getenv("TXT_MMAP_MB", 64)) * 1024 * 1024
+
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_MB", 512)) * 1024 * 1024
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 GOOGLE_CSE_ID = os.getenv("GOOGLE_CSE_ID")
 
-for d in [RAW_DIR, PROCESSED_DIR, LOGS_DIR]:
-    d.mkdir(parents=True, exist_ok=True)
\ No newline at end of file
+for d in [RAW_DIR, PROCESSED_DIR, CACHE_DIR, JOBS_DIR, RESULTS_DIR, LOGS_DIR]:
+    d.mkdir(parents=True, exist_ok=True)
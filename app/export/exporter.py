@@ -1,20 +1,43 @@
 import csv
 import json
 import logging
+import textwrap
 from pathlib import Path
 from datetime import datetime
 
-from app.config import PROCESSED_DIR
+from app.config import (
+    PROCESSED_DIR,
+    EXPORT_FLUSH_EVERY,
+    EXPORT_ROTATE_RECORDS,
+    EXPORT_ROTATE_BYTES,
+    PARQUET_COMPRESSION,
+    PARQUET_ROW_GROUP_SIZE,
+)
+from app.extraction.pages import iter_pages
+from app.metrics import EXPORT_BYTES, EXPORT_RECORDS, EXPORT_SECONDS
 
 logger = logging.getLogger(__name__)
 
+CSV_FIELDS = [
+    "source_type",
+    "source_url",
+    "pdf_url",
+    "file_name",
+    "page_count",
+    "extraction_method",
+    "extracted_text",
+]
 
-def export_to_json(records: list[dict], filename: str = None) -> Path:
+
+def get_output_path(filename: str | None, extension: str) -> Path:
     if not filename:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"extraction_{timestamp}.json"
+        filename = f"extraction_{timestamp}.{extension}"
+    return PROCESSED_DIR / filename
 
-    output_path = PROCESSED_DIR / filename
+
+def export_to_json(records: list[dict], filename: str = None) -> Path:
+    output_path = get_output_path(filename, "json")
 
     with open(output_path, "w", encoding="utf-8") as f:
         json.dump(records, f, indent=2, ensure_ascii=False)
@@ -24,30 +47,262 @@ def export_to_json(records: list[dict], filename: str = None) -> Path:
 
 
 def export_to_csv(records: list[dict], filename: str = None) -> Path:
-    if not filename:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"extraction_{timestamp}.csv"
-
-    output_path = PROCESSED_DIR / filename
+    output_path = get_output_path(filename, "csv")
 
     if not records:
         logger.warning("No records to export")
         return output_path
 
-    fieldnames = [
-        "source_type",
-        "source_url",
-        "pdf_url",
-        "file_name",
-        "page_count",
-        "extraction_method",
-        "extracted_text",
-    ]
-
     with open(output_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
         writer.writeheader()
         writer.writerows(records)
 
     logger.info(f"Exported {len(records)} records to {output_path}")
-    return output_path
\ No newline at end of file
+    return output_path
+
+
+class StreamWriter:
+    """Writes records one at a time, flushing every `flush_every` records.
+
+    With `max_records` or `max_bytes` set, output rotates to numbered files
+    (extraction_<timestamp>_00001.jsonl, ...). The first file is only created
+    when the first record arrives.
+    """
+
+    extension = ""
+
+    def __init__(
+        self,
+        filename: str = None,
+        flush_every: int = EXPORT_FLUSH_EVERY,
+        max_records: int = EXPORT_ROTATE_RECORDS,
+        max_bytes: int = EXPORT_ROTATE_BYTES,
+    ):
+        self.base_path = get_output_path(filename, self.extension)
+        self.flush_every = max(1, flush_every)
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self.paths = []
+        self.count = 0
+        self._file = None
+        self._file_count = 0
+
+    @property
+    def path(self) -> Path | None:
+        return self.paths[-1] if self.paths else None
+
+    def _next_path(self) -> Path:
+        if not (self.max_records or self.max_bytes):
+            return self.base_path
+        return self.base_path.with_name(f"{self.base_path.stem}_{len(self.paths) + 1:05d}{self.base_path.suffix}")
+
+    def _should_rotate(self) -> bool:
+        if self._file_count == 0:
+            return False
+        if self.max_records and self._file_count >= self.max_records:
+            return True
+        return bool(self.max_bytes) and self._file.tell() >= self.max_bytes
+
+    def _open(self) -> None:
+        self.paths.append(self._next_path())
+        self._file = open(self.path, "w", newline="", encoding="utf-8")
+        self._file_count = 0
+        self._start()
+
+    def _finish_file(self) -> None:
+        self._end()
+        self._file.close()
+        self._file = None
+
+    def write(self, record: dict) -> None:
+        with EXPORT_SECONDS.time(format=self.extension):
+            if self._file is None:
+                self._open()
+            elif self._should_rotate():
+                self._finish_file()
+                self._open()
+
+            self._write(record)
+            self.count += 1
+            self._file_count += 1
+            if self.count % self.flush_every == 0:
+                self._flush()
+        EXPORT_RECORDS.inc(format=self.extension)
+
+    def close(self) -> Path | None:
+        if self._file is None:
+            logger.warning("No records to export")
+            return None
+
+        self._finish_file()
+        EXPORT_BYTES.inc(sum(path.stat().st_size for path in self.paths), format=self.extension)
+        if len(self.paths) > 1:
+            logger.info(f"Exported {self.count} records to {len(self.paths)} files starting at {self.paths[0]}")
+        else:
+            logger.info(f"Exported {self.count} records to {self.path}")
+        return self.path
+
+    def _start(self) -> None:
+        pass
+
+    def _write(self, record: dict) -> None:
+        raise NotImplementedError
+
+    def _flush(self) -> None:
+        self._file.flush()
+
+    def _end(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class JSONStreamWriter(StreamWriter):
+    """JSON array output matching export_to_json's layout."""
+
+    extension = "json"
+
+    def _start(self) -> None:
+        self._file.write("[")
+
+    def _write(self, record: dict) -> None:
+        self._file.write(",\n" if self._file_count else "\n")
+        self._file.write(textwrap.indent(json.dumps(record, indent=2, ensure_ascii=False), "  "))
+
+    def _end(self) -> None:
+        self._file.write("\n]" if self._file_count else "]")
+
+
+class JSONLStreamWriter(StreamWriter):
+    """JSON Lines output, one compact record per line."""
+
+    extension = "jsonl"
+
+    def _write(self, record: dict) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False))
+        self._file.write("\n")
+
+
+class CSVStreamWriter(StreamWriter):
+    """CSV output with the same columns as export_to_csv."""
+
+    extension = "csv"
+
+    def _start(self) -> None:
+        self._writer = csv.DictWriter(self._file, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        self._writer.writeheader()
+
+    def _write(self, record: dict) -> None:
+        self._writer.writerow(record)
+
+
+def parquet_schema():
+    import pyarrow as pa
+
+    page = pa.struct([
+        ("page_number", pa.int32()),
+        ("extraction_method", pa.string()),
+        ("text", pa.large_string()),
+    ])
+    return pa.schema([
+        ("source_type", pa.string()),
+        ("source_url", pa.string()),
+        ("pdf_url", pa.string()),
+        ("file_name", pa.string()),
+        ("page_count", pa.int32()),
+        ("extraction_method", pa.string()),
+        ("success", pa.bool_()),
+        ("pages", pa.list_(page)),
+    ])
+
+
+def parquet_row(record: dict) -> dict:
+    row = {field: record.get(field) for field in CSV_FIELDS if field != "extracted_text"}
+    row["success"] = bool(record.get("success"))
+    # The text is stored once, split into pages; DOCX and small TXT files come out as a single page
+    row["pages"] = [
+        {"page_number": page.page_number, "extraction_method": page.extraction_method, "text": page.text}
+        for page in iter_pages(record)
+    ] or None
+    return row
+
+
+class ParquetStreamWriter(StreamWriter):
+    """Parquet output with compressed row groups and per-page text as a list<struct> column.
+
+    Rows are buffered and written one row group at a time, so size-based rotation
+    only sees data that has already been flushed as a row group.
+    """
+
+    extension = "parquet"
+
+    def __init__(
+        self,
+        filename: str = None,
+        row_group_size: int = PARQUET_ROW_GROUP_SIZE,
+        compression: str = PARQUET_COMPRESSION,
+        **kwargs,
+    ):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise RuntimeError("Parquet export requires pyarrow: pip install pyarrow") from e
+
+        super().__init__(filename, **kwargs)
+        self._pa = pa
+        self._pq = pq
+        self._schema = parquet_schema()
+        self.row_group_size = max(1, row_group_size)
+        self.compression = compression
+        self._rows = []
+
+    def _should_rotate(self) -> bool:
+        if self._file_count == 0:
+            return False
+        if self.max_records and self._file_count >= self.max_records:
+            return True
+        return bool(self.max_bytes) and self.path.stat().st_size >= self.max_bytes
+
+    def _open(self) -> None:
+        self.paths.append(self._next_path())
+        self._file = self._pq.ParquetWriter(self.path, self._schema, compression=self.compression)
+        self._file_count = 0
+
+    def _write(self, record: dict) -> None:
+        self._rows.append(parquet_row(record))
+        if len(self._rows) >= self.row_group_size:
+            self._write_row_group()
+
+    def _write_row_group(self) -> None:
+        if self._rows:
+            self._file.write_table(self._pa.Table.from_pylist(self._rows, schema=self._schema))
+            self._rows = []
+
+    def _flush(self) -> None:
+        pass
+
+    def _finish_file(self) -> None:
+        self._write_row_group()
+        self._file.close()
+        self._file = None
+
+
+def export_to_parquet(records: list[dict], filename: str = None) -> Path:
+    with ParquetStreamWriter(filename) as writer:
+        for record in records:
+            writer.write(record)
+    return writer.path
+
+
+STREAM_WRITERS = {
+    "json": JSONStreamWriter,
+    "jsonl": JSONLStreamWriter,
+    "csv": CSVStreamWriter,
+    "parquet": ParquetStreamWriter,
+}
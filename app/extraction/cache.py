@@ -0,0 +1,138 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+
+from app.config import (
+    CACHE_DIR,
+    CACHE_MAX_BYTES,
+    DOCX_PARSER,
+    OCR_BINARIZE,
+    OCR_DPI,
+    OCR_ENGINE,
+    OCR_LANG,
+    OCR_TARGET_DPI,
+    TXT_CHUNK_BYTES,
+    TXT_MMAP_BYTES,
+)
+from app.extraction.text_extractor import MIN_TEXT_LENGTH, MIN_PAGE_TEXT_LENGTH
+
+logger = logging.getLogger(__name__)
+
+EXTRACTOR_VERSION = "1"
+
+_stats = {"hits": 0, "misses": 0}
+_lock = threading.Lock()
+# Running size of CACHE_DIR, so stores only scan the directory once it may be over the cap
+_cache_bytes = None
+
+
+def hash_file(file_path: Path, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def make_cache_key(content_hash: str, extension: str) -> str:
+    settings = {
+        "version": EXTRACTOR_VERSION,
+        "extension": extension,
+        "ocr_dpi": OCR_DPI,
+        "ocr_engine": OCR_ENGINE,
+        "ocr_lang": OCR_LANG,
+        "ocr_target_dpi": OCR_TARGET_DPI,
+        "ocr_binarize": OCR_BINARIZE,
+        "docx_parser": DOCX_PARSER,
+        "txt_chunk_bytes": TXT_CHUNK_BYTES,
+        "txt_mmap_bytes": TXT_MMAP_BYTES,
+        "min_text_length": MIN_TEXT_LENGTH,
+        "min_page_text_length": MIN_PAGE_TEXT_LENGTH,
+    }
+    return hashlib.sha256(f"{content_hash}:{json.dumps(settings, sort_keys=True)}".encode()).hexdigest()
+
+
+def cache_key(file_path: Path) -> str:
+    return make_cache_key(hash_file(file_path), file_path.suffix.lower())
+
+
+def buffer_cache_key(data: bytes, file_name: str) -> str:
+    return make_cache_key(hashlib.sha256(data).hexdigest(), Path(file_name).suffix.lower())
+
+
+def get_cached(key: str) -> dict | None:
+    entry = CACHE_DIR / f"{key}.json"
+    try:
+        with open(entry, "r", encoding="utf-8") as f:
+            result = json.load(f)
+        os.utime(entry)
+    except (OSError, ValueError):
+        with _lock:
+            _stats["misses"] += 1
+        return None
+
+    with _lock:
+        _stats["hits"] += 1
+    return result
+
+
+def store(key: str, result: dict) -> None:
+    entry = CACHE_DIR / f"{key}.json"
+    tmp_path = entry.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    global _cache_bytes
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False)
+        written = tmp_path.stat().st_size
+        replaced = entry.stat().st_size if entry.exists() else 0
+        os.replace(tmp_path, entry)
+    except OSError as e:
+        logger.warning(f"Failed to write cache entry {key}: {e}")
+        tmp_path.unlink(missing_ok=True)
+        return
+
+    with _lock:
+        if _cache_bytes is not None:
+            _cache_bytes += written - replaced
+        over = _cache_bytes is None or _cache_bytes > CACHE_MAX_BYTES
+    if over:
+        evict()
+
+
+def evict(max_bytes: int = CACHE_MAX_BYTES) -> int:
+    entries = []
+    for entry in CACHE_DIR.glob("*.json"):
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry))
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, entry in sorted(entries):
+        if total <= max_bytes:
+            break
+        entry.unlink(missing_ok=True)
+        total -= size
+        removed += 1
+
+    global _cache_bytes
+    with _lock:
+        # Rescanning also picks up entries written by other processes sharing the directory
+        _cache_bytes = total
+    if removed:
+        logger.info(f"Evicted {removed} cache entries")
+    return removed
+
+
+def get_cache_stats() -> dict:
+    entries = list(CACHE_DIR.glob("*.json"))
+    with _lock:
+        stats = dict(_stats)
+    stats["entries"] = len(entries)
+    stats["bytes"] = sum(entry.stat().st_size for entry in entries if entry.exists())
+    return stats
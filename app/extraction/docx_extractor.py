@@ -1,38 +1,163 @@
 import logging
+import zipfile
 from pathlib import Path
+from typing import BinaryIO, Iterator
 from docx import Document
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+from lxml import etree
+
+from app.config import DOCX_PARSER
 
 logger = logging.getLogger(__name__)
 
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+W_BODY = f"{W}body"
+W_P = f"{W}p"
+W_R = f"{W}r"
+W_T = f"{W}t"
+W_BR = f"{W}br"
+W_HYPERLINK = f"{W}hyperlink"
+W_TBL = f"{W}tbl"
+W_TR = f"{W}tr"
+W_TC = f"{W}tc"
+W_TC_PR = f"{W}tcPr"
+W_V_MERGE = f"{W}vMerge"
+W_H_MERGE = f"{W}hMerge"
+W_TYPE = f"{W}type"
+W_VAL = f"{W}val"
+
+# Run children with a fixed text equivalent, matching python-docx's Run.text
+RUN_CHARACTERS = {f"{W}tab": "\t", f"{W}ptab": "\t", f"{W}cr": "\n", f"{W}noBreakHyphen": "-"}
+
+
+def _run_text(run) -> str:
+    parts = []
+    for child in run:
+        if child.tag == W_T:
+            parts.append(child.text or "")
+        elif child.tag == W_BR:
+            # Page and column breaks have no text equivalent
+            if child.get(W_TYPE, "textWrapping") == "textWrapping":
+                parts.append("\n")
+        elif child.tag in RUN_CHARACTERS:
+            parts.append(RUN_CHARACTERS[child.tag])
+    return "".join(parts)
+
+
+def _paragraph_text(paragraph) -> str:
+    parts = []
+    for child in paragraph:
+        if child.tag == W_R:
+            parts.append(_run_text(child))
+        elif child.tag == W_HYPERLINK:
+            parts.extend(_run_text(run) for run in child if run.tag == W_R)
+    return "".join(parts)
+
+
+def _is_merge_continuation(cell) -> bool:
+    properties = cell.find(W_TC_PR)
+    if properties is None:
+        return False
+    for tag in (W_V_MERGE, W_H_MERGE):
+        merge = properties.find(tag)
+        if merge is not None and merge.get(W_VAL, "continue") == "continue":
+            return True
+    return False
+
+
+def _row_text(row) -> str:
+    cells = []
+    for cell in row:
+        if cell.tag != W_TC or _is_merge_continuation(cell):
+            continue
+        text = "\n".join(_paragraph_text(p) for p in cell if p.tag == W_P).strip()
+        if text:
+            cells.append(text)
+    return " | ".join(cells)
+
 
-def extract_text_from_docx(file_path: Path) -> dict:
+def iter_docx_blocks(source: Path | BinaryIO) -> Iterator[str]:
+    """Yield body paragraphs and table rows in reading order, parsing word/document.xml incrementally."""
+    with zipfile.ZipFile(source) as archive, archive.open("word/document.xml") as xml:
+        for _, element in etree.iterparse(xml, events=("end",), tag=(W_P, W_TR), resolve_entities=False):
+            parent = element.getparent()
+            if element.tag == W_P and parent.tag == W_BODY:
+                text = _paragraph_text(element)
+                if text.strip():
+                    yield text
+            elif element.tag == W_TR and parent.tag == W_TBL and parent.getparent().tag == W_BODY:
+                text = _row_text(element)
+                if text:
+                    yield text
+            else:
+                # Paragraphs inside cells are read with their row
+                continue
+
+            # Drop what has been read so memory stays flat on long documents
+            element.clear()
+            while element.getprevious() is not None:
+                del parent[0]
+            if parent.tag == W_TBL:
+                while parent.getprevious() is not None:
+                    del parent.getparent()[0]
+
+
+def iter_python_docx_blocks(source: Path | BinaryIO) -> Iterator[str]:
+    doc = Document(str(source) if isinstance(source, Path) else source)
+    # Document.iter_inner_content() runs an XPath query per block, so walk the body's children directly
+    for element in doc.element.body:
+        if element.tag == W_P:
+            text = Paragraph(element, doc).text
+            if text.strip():
+                yield text
+        elif element.tag == W_TBL:
+            # row.cells repeats a merged cell once per grid column it spans
+            seen = set()
+            for row in Table(element, doc).rows:
+                row_text = []
+                for cell in row.cells:
+                    if cell._tc in seen:
+                        continue
+                    seen.add(cell._tc)
+                    text = cell.text.strip()
+                    if text:
+                        row_text.append(text)
+                if row_text:
+                    yield " | ".join(row_text)
+
+
+DOCX_PARSERS = {
+    "stream": ("docx-xml", iter_docx_blocks),
+    "python-docx": ("python-docx", iter_python_docx_blocks),
+}
+
+
+def extract_text_from_docx(
+    source: Path | BinaryIO,
+    file_name: str | None = None,
+    parser: str = DOCX_PARSER,
+) -> dict:
+    file_name = file_name or source.name
+    extraction_method, iter_blocks = DOCX_PARSERS.get(parser, DOCX_PARSERS["stream"])
     result = {
-        "file_name": file_path.name,
+        "file_name": file_name,
         "page_count": None,
-        "extraction_method": "python-docx",
+        "extraction_method": extraction_method,
         "extracted_text": None,
         "success": False,
     }
 
     try:
-        doc = Document(str(file_path))
-        paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
-
-        for table in doc.tables:
-            for row in table.rows:
-                row_text = [cell.text.strip() for cell in row.cells if cell.text.strip()]
-                if row_text:
-                    paragraphs.append(" | ".join(row_text))
-
-        text = "\n".join(paragraphs)
+        text = "\n".join(iter_blocks(source))
         if text:
             result["extracted_text"] = text
             result["success"] = True
-            logger.info(f"Extracted text from {file_path.name}")
+            logger.info(f"Extracted text from {file_name}")
         else:
-            logger.warning(f"No text found in {file_path.name}")
+            logger.warning(f"No text found in {file_name}")
 
     except Exception as e:
-        logger.error(f"Failed to extract from {file_path.name}: {e}")
+        logger.error(f"Failed to extract from {file_name}: {e}")
 
-    return result
\ No newline at end of file
+    return result
@@ -1,6 +1,15 @@
 import logging
+import os
+import tempfile
+import time
+from io import BytesIO
 from pathlib import Path
+from typing import Callable
 
+from app.config import CACHE_ENABLED
+from app.metrics import EXTRACT_BYTES, EXTRACT_PAGES, EXTRACT_SECONDS
+from app.extraction.cache import buffer_cache_key, cache_key, get_cached, store
+from app.extraction.triage import ROUTE_OCR, ROUTE_REJECT, open_triaged, triage_buffer
 from app.extraction.text_extractor import extract_text_from_pdf
 from app.extraction.docx_extractor import extract_text_from_docx
 from app.extraction.txt_extractor import extract_text_from_txt
@@ -19,22 +28,141 @@ EXTRACTORS = {
     ".bmp": extract_text_from_image,
 }
 
+PROGRESS_EXTRACTORS = {extract_text_from_pdf}
 
-def extract_text(file_path: Path) -> dict:
-    ext = file_path.suffix.lower()
 
-    if ext not in EXTRACTORS:
-        logger.error(f"Unsupported file type: {ext}")
-        return {
-            "file_name": file_path.name,
-            "page_count": None,
-            "extraction_method": None,
-            "extracted_text": None,
-            "success": False,
-        }
+def _failed(file_name: str, page_count: int | None = None, error: str | None = None) -> dict:
+    result = {
+        "file_name": file_name,
+        "page_count": page_count,
+        "extraction_method": None,
+        "extracted_text": None,
+        "success": False,
+    }
+    if error:
+        result["error"] = error
+    return result
 
-    extractor = EXTRACTORS[ext]
-    return extractor(file_path)
+
+def _unsupported(file_name: str) -> dict | None:
+    ext = Path(file_name).suffix.lower()
+    if ext in EXTRACTORS:
+        return None
+    logger.error(f"Unsupported file type: {ext}")
+    return _failed(file_name)
+
+
+def _rejected(file_name: str, triage: dict) -> dict | None:
+    if triage["route"] != ROUTE_REJECT:
+        return None
+    logger.warning(f"Rejected {file_name}: {triage['reason']}")
+    return _failed(file_name, triage["page_count"], triage["reason"])
+
+
+def _cached(key: str | None, file_name: str) -> dict | None:
+    cached = get_cached(key) if key else None
+    if cached:
+        logger.info(f"Cache hit for {file_name}")
+        cached["file_name"] = file_name
+    return cached
+
+
+def _pdf_kwargs(triage: dict, progress: Callable[[int, int], None] | None) -> dict:
+    kwargs = {}
+    if progress:
+        kwargs["progress"] = progress
+    if triage["route"] == ROUTE_OCR:
+        kwargs["image_only"] = True
+    if triage["document"] is not None:
+        # Reuse triage's parse instead of reading the PDF's structure again
+        kwargs.update(document=triage["document"], page_count=triage["page_count"], image_pages=triage["image_pages"])
+    return kwargs
+
+
+def _run_extractor(extractor: Callable, source, triage: dict, **kwargs) -> dict:
+    name = extractor.__name__.removeprefix("extract_text_from_")
+    start = time.perf_counter()
+    result = extractor(source, **kwargs)
+    outcome = "ok" if result.get("success") else "failed"
+    EXTRACT_SECONDS.observe(time.perf_counter() - start, extractor=name, outcome=outcome)
+    EXTRACT_BYTES.observe(triage["size"], extractor=name)
+    if result.get("page_count"):
+        EXTRACT_PAGES.observe(result["page_count"], extractor=name)
+    return result
+
+
+def extract_text(
+    file_path: Path,
+    use_cache: bool = CACHE_ENABLED,
+    progress: Callable[[int, int], None] | None = None,
+) -> dict:
+    failure = _unsupported(file_path.name)
+    if failure:
+        return failure
+
+    # Cache hits skip triage too, so they never pay for parsing the file's structure
+    key = None
+    if use_cache:
+        try:
+            key = cache_key(file_path)
+        except OSError as e:
+            logger.warning(f"Could not hash {file_path.name} for caching: {e}")
+
+    cached = _cached(key, file_path.name)
+    if cached:
+        return cached
+
+    with open_triaged(file_path) as triage:
+        failure = _rejected(file_path.name, triage)
+        if failure:
+            return failure
+
+        extractor = EXTRACTORS[triage["file_type"]]
+        if extractor in PROGRESS_EXTRACTORS:
+            result = _run_extractor(extractor, file_path, triage, **_pdf_kwargs(triage, progress))
+        else:
+            result = _run_extractor(extractor, file_path, triage)
+
+    if key and result.get("success"):
+        store(key, result)
+
+    return result
+
+
+def extract_text_from_buffer(data: bytes, file_name: str, use_cache: bool = CACHE_ENABLED) -> dict:
+    """Extract text from an in-memory upload without writing it to disk first."""
+    failure = _unsupported(file_name)
+    if failure:
+        return failure
+
+    key = buffer_cache_key(data, file_name) if use_cache else None
+    cached = _cached(key, file_name)
+    if cached:
+        return cached
+
+    triage = triage_buffer(data, file_name)
+    failure = _rejected(file_name, triage)
+    if failure:
+        return failure
+
+    extractor = EXTRACTORS[triage["file_type"]]
+    if extractor is extract_text_from_pdf:
+        # Rasterizing pages for OCR needs a real file, so PDFs still go through a temp file
+        fd, tmp_name = tempfile.mkstemp(suffix=".pdf")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            result = _run_extractor(extract_text_from_pdf, Path(tmp_name), triage, **_pdf_kwargs(triage, None))
+        finally:
+            os.unlink(tmp_name)
+        result["file_name"] = file_name
+    else:
+        result = _run_extractor(extractor, BytesIO(data), triage, file_name=file_name)
+
+    if key and result.get("success"):
+        store(key, result)
+
+    return result
 
 
 def get_supported_extensions() -> list[str]:
@@ -1,39 +1,77 @@
 import logging
+import os
+import shutil
+import tempfile
 from pathlib import Path
+from typing import BinaryIO
 from PIL import Image
-import pytesseract
+
+from app.config import OCR_PAGES_PER_TASK
+from app.extraction.ocr import ocr_frames, ocr_image_frames
+from app.extraction.ocr_engine import ocr_image
+from app.extraction.preprocess import preprocess_image
+from app.extraction.text_extractor import join_pages
+from app.metrics import OCR_PAGES, OCR_SECONDS
 
 logger = logging.getLogger(__name__)
 
-SUPPORTED_EXTENSIONS = {".png", ".jpg", ".jpeg", ".tiff", ".bmp"}
+
+def _ocr_frames_in_workers(source: Path | BinaryIO, file_name: str, frame_count: int) -> list[str | None]:
+    logger.info(f"OCR of {frame_count} frames in {file_name}")
+    if isinstance(source, Path):
+        frames = ocr_image_frames(source, frame_count)
+    else:
+        # Workers open the image by path, so spill the upload to a temp file
+        fd, tmp_name = tempfile.mkstemp(suffix=Path(file_name).suffix)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                source.seek(0)
+                shutil.copyfileobj(source, f)
+            frames = ocr_image_frames(Path(tmp_name), frame_count)
+        finally:
+            os.unlink(tmp_name)
+    return [frames.get(frame) for frame in range(1, frame_count + 1)]
 
 
-def extract_text_from_image(file_path: Path) -> dict:
+def extract_text_from_image(source: Path | BinaryIO, file_name: str | None = None) -> dict:
+    file_name = file_name or source.name
     result = {
-        "file_name": file_path.name,
+        "file_name": file_name,
         "page_count": 1,
         "extraction_method": "ocr",
         "extracted_text": None,
         "success": False,
     }
 
-    if file_path.suffix.lower() not in SUPPORTED_EXTENSIONS:
-        logger.error(f"Unsupported image format: {file_path.suffix}")
-        return result
-
     try:
-        image = Image.open(file_path)
-        text = pytesseract.image_to_string(image)
-        text = text.strip()
+        with Image.open(source) as image:
+            # n_frames walks the frame headers without decoding pixel data
+            frame_count = getattr(image, "n_frames", 1)
+            if frame_count == 1:
+                with OCR_SECONDS.time(phase="preprocess"):
+                    prepared = preprocess_image(image)
+                OCR_PAGES.inc()
+                with OCR_SECONDS.time(phase="recognize"):
+                    texts = [ocr_image(prepared)]
+            elif frame_count <= OCR_PAGES_PER_TASK:
+                # A single task's worth of frames; OCR them here rather than shipping them to a worker
+                texts = [text for _, text in ocr_frames(image, 1, frame_count)]
+
+        if frame_count > OCR_PAGES_PER_TASK:
+            texts = _ocr_frames_in_workers(source, file_name, frame_count)
+
+        result["page_count"] = frame_count
+        text, pages = join_pages([text.strip() if text else "" for text in texts], ["ocr"] * frame_count)
 
         if text:
             result["extracted_text"] = text
+            result["pages"] = pages
             result["success"] = True
-            logger.info(f"Extracted text from {file_path.name}")
+            logger.info(f"Extracted text from {file_name}")
         else:
-            logger.warning(f"No text found in {file_path.name}")
+            logger.warning(f"No text found in {file_name}")
 
     except Exception as e:
-        logger.error(f"Failed to extract from {file_path.name}: {e}")
+        logger.error(f"Failed to extract from {file_name}: {e}")
 
     return result
\ No newline at end of file
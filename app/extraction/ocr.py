@@ -1,24 +1,232 @@
+import atexit
 import logging
+import multiprocessing
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
 from pathlib import Path
-import pytesseract
-from pdf2image import convert_from_path
+from typing import Callable
+from pdf2image import convert_from_path, pdfinfo_from_path
+from PIL import Image
+
+from app.config import OCR_DPI, OCR_WORKERS, OCR_PAGES_PER_TASK, OCR_WINDOW_SIZE
+from app.extraction.ocr_engine import ocr_images
+from app.extraction.preprocess import preprocess_image
+from app.metrics import OCR_PAGES, OCR_SECONDS, merge, run_collecting
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on OCR processes per document; lowered in processes that are already one of many workers
+_max_workers = OCR_WORKERS
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def limit_ocr_workers(workers: int = 1) -> None:
+    """Pool initializer for extraction workers, so each one OCRs in-process instead of starting its own pool."""
+    global _max_workers
+    _max_workers = max(1, workers)
+
+
+def _get_pool(broken: ProcessPoolExecutor | None = None) -> ProcessPoolExecutor:
+    """The shared OCR pool, started on first use so later documents skip the process start-up.
+
+    Pass a pool that has broken to have it replaced.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool is broken:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=_max_workers, mp_context=multiprocessing.get_context("forkserver"))
+            atexit.register(_pool.shutdown)
+        return _pool
+
+
+def get_pdf_page_count(pdf_path: Path) -> int:
+    info = pdfinfo_from_path(str(pdf_path))
+    return int(info["Pages"])
 
-def extract_text_ocr(pdf_path: Path, dpi: int = 200) -> str:
-    try:
-        images = convert_from_path(str(pdf_path), dpi=dpi)
-    except Exception as e:
-        logger.error(f"Failed to convert PDF to images: {e}")
-        raise
 
-    text_parts = []
-    for i, image in enumerate(images):
+def _ocr_page_range(pdf_path: str, first_page: int, last_page: int, dpi: int) -> list[tuple[int, str | None]]:
+    window_size = max(1, OCR_WINDOW_SIZE)
+    results = []
+    for window_first in range(first_page, last_page + 1, window_size):
+        window_last = min(window_first + window_size - 1, last_page)
         try:
-            page_text = pytesseract.image_to_string(image)
-            text_parts.append(page_text)
+            with OCR_SECONDS.time(phase="rasterize"):
+                images = convert_from_path(
+                    pdf_path, dpi=dpi, first_page=window_first, last_page=window_last, grayscale=True
+                )
         except Exception as e:
-            logger.warning(f"OCR failed on page {i + 1}: {e}")
+            logger.warning(f"Failed to convert pages {window_first}-{window_last} to images: {e}")
+            results.extend((page, None) for page in range(window_first, window_last + 1))
+            continue
+
+        # The whole window goes to the engine at once so the CLI engine starts tesseract once per window
+        prepared = []
+        with OCR_SECONDS.time(phase="preprocess"):
+            page_number = window_first
+            while images:
+                image = images.pop(0)
+                try:
+                    prepared.append(preprocess_image(image, source_dpi=dpi))
+                except Exception as e:
+                    logger.warning(f"Failed to preprocess page {page_number}: {e}")
+                    prepared.append(None)
+                finally:
+                    image.close()
+                page_number += 1
+
+        decoded = [page for page in prepared if page is not None]
+        try:
+            OCR_PAGES.inc(len(decoded))
+            with OCR_SECONDS.time(phase="recognize"):
+                texts = iter(ocr_images(decoded))
+        except Exception as e:
+            logger.warning(f"OCR failed on pages {window_first}-{window_last}: {e}")
+            texts = iter([None] * len(decoded))
+        for page_number, prepared_page in enumerate(prepared, start=window_first):
+            text = next(texts) if prepared_page is not None else None
+            if text is None:
+                logger.warning(f"OCR failed on page {page_number}")
+            results.append((page_number, text))
+
+    return results
+
+
+def group_page_ranges(page_numbers: list[int], max_pages: int) -> list[tuple[int, int]]:
+    max_pages = max(1, max_pages)
+    ranges = []
+    for page in sorted(set(page_numbers)):
+        if ranges and page == ranges[-1][1] + 1 and page - ranges[-1][0] < max_pages:
+            ranges[-1] = (ranges[-1][0], page)
+        else:
+            ranges.append((page, page))
+    return ranges
+
+
+def _run_page_ranges(
+    task: Callable,
+    path: Path,
+    page_numbers: list[int],
+    workers: int,
+    on_pages_done: Callable[[int], None] | None,
+    *args,
+) -> tuple[dict[int, str | None], int]:
+    ranges = group_page_ranges(page_numbers, OCR_PAGES_PER_TASK)
+    workers = max(1, min(workers, _max_workers, len(ranges)))
+    pages = {}
+
+    if workers == 1:
+        for first, last in ranges:
+            pages.update(task(str(path), first, last, *args))
+            if on_pages_done:
+                on_pages_done(last - first + 1)
+    else:
+        # The pool is shared, so this document keeps at most `workers` ranges in flight
+        pool = _get_pool()
+        pending = iter(ranges)
+        futures = {}
+
+        def submit(count: int) -> None:
+            nonlocal pool
+            for first, last in islice(pending, count):
+                try:
+                    future = pool.submit(run_collecting, task, str(path), first, last, *args)
+                except (BrokenProcessPool, RuntimeError):
+                    # Broken, or already replaced by another document that saw it break
+                    pool = _get_pool(broken=pool)
+                    future = pool.submit(run_collecting, task, str(path), first, last, *args)
+                futures[future] = (first, last)
+
+        submit(workers)
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                first, last = futures.pop(future)
+                try:
+                    range_pages, worker_metrics = future.result()
+                    pages.update(range_pages)
+                    merge(worker_metrics)
+                except BrokenProcessPool as e:
+                    logger.warning(f"OCR worker died on pages {first}-{last}, restarting the pool: {e}")
+                    pool = _get_pool(broken=pool)
+                except Exception as e:
+                    logger.warning(f"OCR worker failed on pages {first}-{last}: {e}")
+                if on_pages_done:
+                    on_pages_done(last - first + 1)
+            submit(len(done))
+
+    return pages, workers
+
+
+def ocr_pdf_pages(
+    pdf_path: Path,
+    page_numbers: list[int],
+    dpi: int = OCR_DPI,
+    workers: int = OCR_WORKERS,
+    on_pages_done: Callable[[int], None] | None = None,
+) -> dict[int, str | None]:
+    pages, workers = _run_page_ranges(_ocr_page_range, pdf_path, page_numbers, workers, on_pages_done, dpi)
+    logger.info(f"OCR processed {len(pages)} pages of {pdf_path.name} using {workers} workers")
+    return pages
+
+
+def ocr_frames(image: Image.Image, first_frame: int, last_frame: int) -> list[tuple[int, str | None]]:
+    window_size = max(1, OCR_WINDOW_SIZE)
+    results = []
+    for window_first in range(first_frame, last_frame + 1, window_size):
+        window_last = min(window_first + window_size - 1, last_frame)
+        prepared = []
+        with OCR_SECONDS.time(phase="preprocess"):
+            for frame in range(window_first, window_last + 1):
+                try:
+                    # Seeking only decodes this frame; preprocessing copies it out before the next seek
+                    image.seek(frame - 1)
+                    prepared.append(preprocess_image(image, source_dpi=image.info.get("dpi", (None,))[0]))
+                except Exception as e:
+                    logger.warning(f"Failed to decode frame {frame}: {e}")
+                    prepared.append(None)
+
+        decoded = [frame for frame in prepared if frame is not None]
+        try:
+            OCR_PAGES.inc(len(decoded))
+            with OCR_SECONDS.time(phase="recognize"):
+                texts = iter(ocr_images(decoded))
+        except Exception as e:
+            logger.warning(f"OCR failed on frames {window_first}-{window_last}: {e}")
+            texts = iter([None] * len(decoded))
+        for frame, prepared_frame in enumerate(prepared, start=window_first):
+            results.append((frame, next(texts) if prepared_frame is not None else None))
+
+    return results
+
+
+def _ocr_frame_range(image_path: str, first_frame: int, last_frame: int) -> list[tuple[int, str | None]]:
+    with Image.open(image_path) as image:
+        return ocr_frames(image, first_frame, last_frame)
+
+
+def ocr_image_frames(
+    image_path: Path,
+    frame_count: int,
+    workers: int = OCR_WORKERS,
+) -> dict[int, str | None]:
+    """OCR every frame of a multi-page image, such as a fax TIFF, with frames split across workers."""
+    pages, workers = _run_page_ranges(_ocr_frame_range, image_path, list(range(1, frame_count + 1)), workers, None)
+    logger.info(f"OCR processed {len(pages)} frames of {image_path.name} using {workers} workers")
+    return pages
+
+
+def extract_text_ocr(pdf_path: Path, dpi: int = OCR_DPI, workers: int = OCR_WORKERS) -> str:
+    try:
+        page_count = get_pdf_page_count(pdf_path)
+    except Exception as e:
+        logger.error(f"Failed to read page count for OCR: {e}")
+        raise
 
-    return "\n\n".join(text_parts)
\ No newline at end of file
+    pages = ocr_pdf_pages(pdf_path, list(range(1, page_count + 1)), dpi=dpi, workers=workers)
+    return "\n\n".join(pages[page] for page in sorted(pages) if pages[page] is not None)
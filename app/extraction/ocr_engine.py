@@ -0,0 +1,133 @@
+import importlib.util
+import logging
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+import pytesseract
+from PIL import Image
+
+from app.config import OCR_ENGINE, OCR_LANG
+
+logger = logging.getLogger(__name__)
+
+PAGE_SEPARATOR = "\f"
+
+
+class TesserocrEngine:
+    """Keeps one Tesseract API, with its language model loaded, for the life of the thread."""
+
+    name = "tesserocr"
+
+    def __init__(self, lang: str = OCR_LANG):
+        import tesserocr
+
+        self.api = tesserocr.PyTessBaseAPI(lang=lang)
+
+    def recognize(self, image: Image.Image) -> str:
+        self.api.SetImage(image)
+        return self.api.GetUTF8Text()
+
+    def recognize_batch(self, images: list[Image.Image]) -> list[str | None]:
+        texts = []
+        for image in images:
+            try:
+                texts.append(self.recognize(image))
+            except Exception as e:
+                logger.warning(f"OCR failed on image: {e}")
+                texts.append(None)
+        return texts
+
+
+class TesseractCLIEngine:
+    """Runs the tesseract binary once per batch, passing every image through a file list."""
+
+    name = "tesseract"
+
+    def __init__(self, lang: str = OCR_LANG):
+        self.lang = lang
+
+    def _run(self, input_path: Path) -> str:
+        proc = subprocess.run(
+            [pytesseract.pytesseract.tesseract_cmd, str(input_path), "stdout", "-l", self.lang,
+             "-c", f"page_separator={PAGE_SEPARATOR}"],
+            capture_output=True,
+            check=True,
+        )
+        return proc.stdout.decode("utf-8", errors="replace")
+
+    def recognize(self, image: Image.Image) -> str:
+        text = self.recognize_batch([image])[0]
+        if text is None:
+            raise RuntimeError("Tesseract failed to read the image")
+        return text
+
+    def recognize_batch(self, images: list[Image.Image]) -> list[str | None]:
+        if not images:
+            return []
+
+        with tempfile.TemporaryDirectory(prefix="ocr_") as tmp:
+            paths = []
+            for index, image in enumerate(images):
+                # Uncompressed PNM is the cheapest format for both sides to write and read
+                path = Path(tmp) / f"{index:05d}.pnm"
+                if image.mode not in ("1", "L", "RGB"):
+                    image = image.convert("RGB")
+                image.save(path, format="PPM")
+                paths.append(path)
+            list_path = Path(tmp) / "images.txt"
+            list_path.write_text("\n".join(str(path) for path in paths) + "\n")
+
+            try:
+                pages = self._run(list_path).split(PAGE_SEPARATOR)
+                if len(pages) == len(images) + 1:
+                    return pages[:-1]
+                logger.warning(f"Tesseract returned {len(pages) - 1} pages for {len(images)} images, retrying one by one")
+            except OSError as e:
+                logger.warning(f"Could not run tesseract: {e}")
+                return [None] * len(images)
+            except subprocess.CalledProcessError as e:
+                if len(images) == 1:
+                    logger.warning(f"OCR failed on image: {e}")
+                    return [None]
+                logger.warning(f"Batched OCR failed, retrying one by one: {e}")
+
+            texts = []
+            for path in paths:
+                try:
+                    texts.append(self._run(path).rstrip(PAGE_SEPARATOR))
+                except (OSError, subprocess.CalledProcessError) as e:
+                    logger.warning(f"OCR failed on image: {e}")
+                    texts.append(None)
+            return texts
+
+
+_local = threading.local()
+
+
+def create_engine(name: str = OCR_ENGINE):
+    if name in ("auto", "tesserocr") and importlib.util.find_spec("tesserocr"):
+        try:
+            return TesserocrEngine()
+        except Exception as e:
+            logger.warning(f"Could not start tesserocr, using the tesseract CLI: {e}")
+    elif name == "tesserocr":
+        logger.warning("tesserocr is not installed, using the tesseract CLI")
+    return TesseractCLIEngine()
+
+
+def get_engine():
+    """Return this thread's OCR engine, creating it on first use so the model is loaded once."""
+    engine = getattr(_local, "engine", None)
+    if engine is None:
+        engine = _local.engine = create_engine()
+        logger.debug(f"Started {engine.name} OCR engine")
+    return engine
+
+
+def ocr_image(image: Image.Image) -> str:
+    return get_engine().recognize(image)
+
+
+def ocr_images(images: list[Image.Image]) -> list[str | None]:
+    return get_engine().recognize_batch(images)
@@ -0,0 +1,61 @@
+from typing import Iterable, Iterator
+
+
+class Page:
+    """One page of an extraction result. `start` and `end` are offsets into the result's `extracted_text`."""
+
+    __slots__ = ("page_number", "extraction_method", "start", "end", "text")
+
+    def __init__(self, page_number: int, extraction_method: str | None, start: int, end: int, text: str):
+        self.page_number = page_number
+        self.extraction_method = extraction_method
+        self.start = start
+        self.end = end
+        self.text = text
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def page_count(result: dict) -> int:
+    return result.get("page_count") or len(result.get("pages") or []) or 1
+
+
+def iter_pages(result: dict, page_numbers: Iterable[int] | None = None) -> Iterator[Page]:
+    """Yield the result's pages, or only `page_numbers`, slicing each page's text out of `extracted_text`."""
+    text = result.get("extracted_text") or ""
+    pages = result.get("pages")
+    if not pages:
+        if not text:
+            return
+        # Extractors without page boundaries (DOCX, small TXT) produce a single page
+        pages = [{"page_number": 1, "extraction_method": result.get("extraction_method"), "start": 0, "end": len(text)}]
+
+    wanted = set(page_numbers) if page_numbers is not None else None
+    for page in pages:
+        if wanted is None or page["page_number"] in wanted:
+            yield Page(page["page_number"], page["extraction_method"], page["start"], page["end"], text[page["start"]:page["end"]])
+
+
+def parse_page_ranges(spec: str, last_page: int) -> list[int]:
+    """Turn a range list like "1-3,7,10-" into sorted page numbers, clipped to `last_page`.
+
+    A range that starts past `last_page` is an error rather than an empty selection.
+    """
+    numbers = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, dash, last = part.partition("-")
+        try:
+            start = int(first) if first else 1
+            end = (int(last) if last else last_page) if dash else start
+        except ValueError:
+            raise ValueError(f"Invalid page range: {part!r}") from None
+        if start > last_page:
+            raise ValueError(f"Page range {part!r} is past the last page ({last_page})")
+        if start < 1 or end < start:
+            raise ValueError(f"Invalid page range: {part!r}")
+        numbers.update(range(start, min(end, last_page) + 1))
+    return sorted(numbers)
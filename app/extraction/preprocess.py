@@ -0,0 +1,58 @@
+import numpy as np
+from PIL import Image, ImageOps
+
+from app.config import OCR_BINARIZE, OCR_TARGET_DPI
+
+# Used to estimate the DPI of images that do not carry a trustworthy one,
+# such as phone photos of a page (A4 long edge)
+PAGE_LONG_EDGE_INCHES = 11.7
+
+
+def otsu_threshold(pixels: np.ndarray) -> int:
+    """Return the grey level that best separates ink from background."""
+    hist = np.bincount(pixels.ravel(), minlength=256).astype(np.float64)
+    probs = hist / hist.sum()
+    omega = np.cumsum(probs)
+    mu = np.cumsum(probs * np.arange(256))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        between = (mu[-1] * omega - mu) ** 2 / (omega * (1.0 - omega))
+    return int(np.argmax(np.nan_to_num(between)))
+
+
+def binarize(image: Image.Image) -> Image.Image:
+    pixels = np.asarray(image, dtype=np.uint8)
+    threshold = otsu_threshold(pixels)
+    return Image.fromarray(np.where(pixels > threshold, 255, 0).astype(np.uint8), mode="L")
+
+
+def target_size(size: tuple[int, int], source_dpi: float | None, target_dpi: int) -> tuple[int, int]:
+    if source_dpi:
+        scale = target_dpi / source_dpi
+    else:
+        scale = target_dpi * PAGE_LONG_EDGE_INCHES / max(size)
+    if scale >= 1:
+        return size
+    return max(1, round(size[0] * scale)), max(1, round(size[1] * scale))
+
+
+def preprocess_image(
+    image: Image.Image,
+    source_dpi: float | None = None,
+    target_dpi: int = OCR_TARGET_DPI,
+    binarize_image: bool = OCR_BINARIZE,
+) -> Image.Image:
+    """Grayscale, downscale to `target_dpi` and optionally binarize an image before OCR."""
+    size = target_size(image.size, source_dpi, target_dpi)
+    if image.format == "JPEG" and size != image.size:
+        # Let the JPEG decoder drop resolution by 1/2, 1/4 or 1/8 instead of decoding every pixel
+        image.draft("L", size)
+
+    image = ImageOps.exif_transpose(image)
+    if image.mode != "L":
+        image = image.convert("L")
+    if image.size != size:
+        # exif_transpose may have swapped the axes
+        width, height = size if (image.width >= image.height) == (size[0] >= size[1]) else size[::-1]
+        image = image.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=2.0)
+
+    return binarize(image) if binarize_image else image
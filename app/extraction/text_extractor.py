@@ -1,55 +1,195 @@
 import logging
+from io import StringIO
 from pathlib import Path
-from pdfminer.high_level import extract_text
+from typing import Callable, Collection
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LAParams
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
 from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import resolve1
+from pdfminer.utils import decode_text
 
-from app.extraction.ocr import extract_text_ocr
+from app.extraction.ocr import get_pdf_page_count, ocr_pdf_pages
+from app.metrics import OCR_FALLBACK_DOCUMENTS, OCR_FALLBACK_PAGES
 
 logger = logging.getLogger(__name__)
 
 MIN_TEXT_LENGTH = 50
+MIN_PAGE_TEXT_LENGTH = 20
+PAGE_SEPARATOR = "\n\n"
+METADATA_FIELDS = ["Title", "Author", "Subject", "Keywords", "Creator", "Producer", "CreationDate", "ModDate"]
 
 
-def get_page_count(pdf_path: Path) -> int:
-    try:
-        with open(pdf_path, "rb") as f:
-            return sum(1 for _ in PDFPage.get_pages(f))
-    except Exception:
-        return 0
+def _decode_metadata_value(value) -> str | None:
+    value = resolve1(value)
+    if isinstance(value, bytes):
+        return decode_text(value)
+    if isinstance(value, str):
+        return value
+    return None
+
+
+def read_pdf_metadata(document: PDFDocument) -> dict:
+    metadata = {}
+    for info in document.info:
+        for key in METADATA_FIELDS:
+            if key in info and key.lower() not in metadata:
+                value = _decode_metadata_value(info[key])
+                if value:
+                    metadata[key.lower()] = value
+    return metadata
+
+
+def _parse_document(document: PDFDocument, file_name: str, skip_pages: Collection[int]) -> tuple[list[str], dict]:
+    rsrcmgr = PDFResourceManager()
+    output = StringIO()
+    pages = []
+
+    with TextConverter(rsrcmgr, output, laparams=LAParams()) as device:
+        metadata = read_pdf_metadata(document)
+        interpreter = PDFPageInterpreter(rsrcmgr, device)
+
+        for page_number, page in enumerate(PDFPage.create_pages(document), start=1):
+            if page_number in skip_pages:
+                pages.append("")
+                continue
+            try:
+                interpreter.process_page(page)
+                pages.append(output.getvalue().strip())
+            except Exception as e:
+                logger.warning(f"pdfminer failed on page {page_number} of {file_name}: {e}")
+                pages.append("")
+            output.seek(0)
+            output.truncate(0)
+
+    return pages, metadata
+
+
+def parse_pdf(
+    pdf_path: Path,
+    document: PDFDocument | None = None,
+    skip_pages: Collection[int] = (),
+) -> tuple[list[str], dict]:
+    """Page texts and metadata, reusing an already parsed `document` if given.
+
+    Pages in `skip_pages`, such as those triage found to be images only, come back empty
+    without layout analysis.
+    """
+    if document is not None:
+        return _parse_document(document, pdf_path.name, skip_pages)
+    with open(pdf_path, "rb") as f:
+        return _parse_document(PDFDocument(PDFParser(f)), pdf_path.name, skip_pages)
+
+
+def read_pdf_outline(pdf_path: Path) -> tuple[int, dict]:
+    """Return the page count and metadata without running layout analysis."""
+    with open(pdf_path, "rb") as f:
+        document = PDFDocument(PDFParser(f))
+        return sum(1 for _ in PDFPage.create_pages(document)), read_pdf_metadata(document)
+
 
+def join_pages(page_texts: list[str], methods: list[str]) -> tuple[str, list[dict]]:
+    parts = []
+    pages = []
+    offset = 0
 
-def extract_text_from_pdf(pdf_path: Path) -> dict:
+    for page_number, (text, method) in enumerate(zip(page_texts, methods), start=1):
+        if text:
+            if parts:
+                offset += len(PAGE_SEPARATOR)
+            parts.append(text)
+        pages.append({
+            "page_number": page_number,
+            "extraction_method": method,
+            "start": offset,
+            "end": offset + len(text),
+        })
+        offset += len(text)
+
+    return PAGE_SEPARATOR.join(parts), pages
+
+
+def extract_text_from_pdf(
+    pdf_path: Path,
+    progress: Callable[[int, int], None] | None = None,
+    image_only: bool = False,
+    document: PDFDocument | None = None,
+    page_count: int | None = None,
+    image_pages: Collection[int] = (),
+) -> dict:
+    """Extract a PDF's text, OCRing pages with too little of it.
+
+    Triage passes the `document` it parsed, with its `page_count` and `image_pages`, so the
+    file is not parsed a second time.
+    """
     result = {
         "file_name": pdf_path.name,
-        "page_count": get_page_count(pdf_path),
+        "page_count": 0,
         "extraction_method": None,
         "extracted_text": None,
         "success": False,
     }
 
     try:
-        text = extract_text(str(pdf_path))
-        text = text.strip() if text else ""
-
-        if len(text) >= MIN_TEXT_LENGTH:
-            result["extraction_method"] = "pdfminer"
-            result["extracted_text"] = text
-            result["success"] = True
-            logger.info(f"Extracted text from {pdf_path.name} using pdfminer")
-            return result
+        if image_only:
+            # Triage found no text layer, so skip the layout pass and OCR every page
+            if document is not None and page_count:
+                result["metadata"] = read_pdf_metadata(document)
+            else:
+                page_count, result["metadata"] = read_pdf_outline(pdf_path)
+            page_texts = [""] * page_count
+        else:
+            page_texts, result["metadata"] = parse_pdf(pdf_path, document, set(image_pages))
     except Exception as e:
         logger.warning(f"pdfminer failed for {pdf_path.name}: {e}")
-
-    try:
-        text = extract_text_ocr(pdf_path)
-        if text and len(text) >= MIN_TEXT_LENGTH:
-            result["extraction_method"] = "ocr"
-            result["extracted_text"] = text
-            result["success"] = True
-            logger.info(f"Extracted text from {pdf_path.name} using OCR")
+        try:
+            page_texts = [""] * get_pdf_page_count(pdf_path)
+        except Exception as e:
+            logger.error(f"Could not read {pdf_path.name}: {e}")
             return result
-    except Exception as e:
-        logger.warning(f"OCR failed for {pdf_path.name}: {e}")
+
+    result["page_count"] = len(page_texts)
+    methods = ["pdfminer"] * len(page_texts)
+    low_text_pages = [
+        page_number
+        for page_number, text in enumerate(page_texts, start=1)
+        if len(text) < MIN_PAGE_TEXT_LENGTH
+    ]
+
+    pages_done = len(page_texts) - len(low_text_pages)
+    if progress:
+        progress(pages_done, len(page_texts))
+
+    def on_pages_done(count: int) -> None:
+        nonlocal pages_done
+        pages_done += count
+        if progress:
+            progress(pages_done, len(page_texts))
+
+    if low_text_pages:
+        logger.info(f"Routing {len(low_text_pages)}/{len(page_texts)} pages of {pdf_path.name} to OCR")
+        OCR_FALLBACK_DOCUMENTS.inc()
+        OCR_FALLBACK_PAGES.inc(len(low_text_pages))
+        try:
+            for page_number, text in ocr_pdf_pages(pdf_path, low_text_pages, on_pages_done=on_pages_done).items():
+                text = text.strip() if text else ""
+                if len(text) > len(page_texts[page_number - 1]):
+                    page_texts[page_number - 1] = text
+                    methods[page_number - 1] = "ocr"
+        except Exception as e:
+            logger.warning(f"OCR failed for {pdf_path.name}: {e}")
+
+    text, pages = join_pages(page_texts, methods)
+    if len(text) >= MIN_TEXT_LENGTH:
+        used = set(methods)
+        result["extraction_method"] = used.pop() if len(used) == 1 else "hybrid"
+        result["extracted_text"] = text
+        result["pages"] = pages
+        result["success"] = True
+        logger.info(f"Extracted text from {pdf_path.name} using {result['extraction_method']}")
+        return result
 
     logger.error(f"All extraction methods failed for {pdf_path.name}")
-    return result
\ No newline at end of file
+    return result
@@ -0,0 +1,178 @@
+import logging
+import os
+import zipfile
+from contextlib import contextmanager
+from io import BytesIO
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+from pdfminer.pdfdocument import PDFDocument, PDFPasswordIncorrect, PDFEncryptionError
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import resolve1
+from pdfminer.psparser import literal_name
+
+from app.config import MAX_FILE_BYTES, MAX_TXT_BYTES
+
+logger = logging.getLogger(__name__)
+
+ROUTE_TEXT = "text"
+ROUTE_OCR = "ocr"
+ROUTE_REJECT = "reject"
+
+HEADER_SIZE = 1024
+
+MAGIC_SIGNATURES = [
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"II*\x00", ".tiff"),
+    (b"MM\x00*", ".tiff"),
+    (b"PK\x03\x04", ".docx"),
+]
+
+# Size limits for types that are not loaded whole; everything else is held to `max_bytes`
+MAX_BYTES_BY_TYPE = {".txt": MAX_TXT_BYTES}
+
+
+def detect_file_type(header: bytes, ext: str) -> str | None:
+    """Return the extension matching the file's content, or None if it is not a supported type."""
+    # PDF readers accept the header anywhere in the first kilobyte, but text that merely
+    # mentions it is common, so only files named .pdf get that leeway
+    if header.startswith(b"%PDF-") or (ext == ".pdf" and b"%PDF-" in header):
+        return ".pdf"
+    for signature, file_type in MAGIC_SIGNATURES:
+        if header.startswith(signature):
+            return file_type
+    # "BM" alone is too common at the start of text files; also require the zeroed reserved fields
+    if header.startswith(b"BM") and header[6:10] == b"\x00\x00\x00\x00":
+        return ".bmp"
+    return ".txt" if ext == ".txt" else None
+
+
+def _page_kind(page: PDFPage) -> str | None:
+    resources = resolve1(page.resources) or {}
+    if resolve1(resources.get("Font")):
+        return "text"
+
+    has_image = False
+    for xobject in (resolve1(resources.get("XObject")) or {}).values():
+        subtype = resolve1(resolve1(xobject).get("Subtype"))
+        subtype = literal_name(subtype) if subtype else None
+        if subtype == "Form":
+            # Form XObjects can carry their own fonts; let pdfminer look inside
+            return "text"
+        if subtype == "Image":
+            has_image = True
+
+    return "image" if has_image else None
+
+
+def triage_pdf(source: BinaryIO, triage: dict) -> dict:
+    try:
+        document = PDFDocument(PDFParser(source))
+        triage["encrypted"] = document.encryption is not None
+        kinds = [_page_kind(page) for page in PDFPage.create_pages(document)]
+    except (PDFPasswordIncorrect, PDFEncryptionError):
+        triage.update(encrypted=True, route=ROUTE_REJECT, reason="PDF is encrypted and cannot be opened")
+        return triage
+    except Exception as e:
+        # Truncated or damaged files often still render; poppler counts the pages and OCR reads them
+        logger.warning(f"pdfminer could not parse the PDF, routing it to OCR: {e}")
+        triage.update(route=ROUTE_OCR, reason=f"Unreadable PDF structure: {e}")
+        return triage
+
+    triage["document"] = document
+    triage["page_count"] = len(kinds)
+    triage["image_pages"] = [page for page, kind in enumerate(kinds, start=1) if kind == "image"]
+
+    if not kinds:
+        triage.update(route=ROUTE_REJECT, reason="PDF has no pages")
+    elif "text" not in kinds and triage["image_pages"]:
+        triage["route"] = ROUTE_OCR
+    return triage
+
+
+def _new_triage() -> dict:
+    return {
+        "file_type": None,
+        "size": None,
+        "route": ROUTE_TEXT,
+        "reason": None,
+        "page_count": None,
+        "encrypted": False,
+        "image_pages": [],
+        # The parsed PDFDocument, usable while the triaged source stays open
+        "document": None,
+    }
+
+
+def triage_stream(source: BinaryIO, file_name: str, size: int, max_bytes: int = MAX_FILE_BYTES) -> dict:
+    """Inspect headers and PDF structure to decide how a file should be extracted."""
+    ext = Path(file_name).suffix.lower()
+    triage = _new_triage()
+    triage["size"] = size
+
+    header = source.read(HEADER_SIZE)
+    source.seek(0)
+    if not header:
+        triage.update(route=ROUTE_REJECT, reason="File is empty")
+        return triage
+
+    file_type = detect_file_type(header, ext)
+    triage["file_type"] = file_type
+    if file_type is None:
+        triage.update(route=ROUTE_REJECT, reason=f"Content does not match any supported format (extension {ext or 'none'})")
+        return triage
+
+    limit = MAX_BYTES_BY_TYPE.get(file_type, max_bytes)
+    if limit and size > limit:
+        triage.update(route=ROUTE_REJECT, reason=f"File is {size / 1024 / 1024:.0f} MB, over the size limit")
+        return triage
+    if file_type != ext and {file_type, ext} != {".jpg", ".jpeg"}:
+        logger.info(f"{file_name} is really {file_type}, routing by content")
+
+    if file_type == ".pdf":
+        return triage_pdf(source, triage)
+
+    if file_type == ".docx":
+        try:
+            with zipfile.ZipFile(source) as archive:
+                if "word/document.xml" not in archive.namelist():
+                    triage.update(route=ROUTE_REJECT, reason="ZIP archive is not a DOCX document")
+        except zipfile.BadZipFile as e:
+            triage.update(route=ROUTE_REJECT, reason=f"Corrupt DOCX: {e}")
+        return triage
+
+    if file_type != ".txt":
+        triage["route"] = ROUTE_OCR
+    return triage
+
+
+@contextmanager
+def open_triaged(file_path: Path, max_bytes: int = MAX_FILE_BYTES) -> Iterator[dict]:
+    """Triage a file and keep it open for the block, so extraction can reuse a PDF's parsed `document`."""
+    triage = _new_triage()
+    try:
+        f = open(file_path, "rb")
+    except OSError as e:
+        triage.update(route=ROUTE_REJECT, reason=f"Unreadable file: {e}")
+        yield triage
+        return
+
+    with f:
+        try:
+            triage = triage_stream(f, file_path.name, os.fstat(f.fileno()).st_size, max_bytes)
+        except OSError as e:
+            triage.update(route=ROUTE_REJECT, reason=f"Unreadable file: {e}")
+        yield triage
+
+
+def triage_file(file_path: Path, max_bytes: int = MAX_FILE_BYTES) -> dict:
+    with open_triaged(file_path, max_bytes) as triage:
+        # Closed along with the file
+        triage["document"] = None
+        return triage
+
+
+def triage_buffer(data: bytes, file_name: str, max_bytes: int = MAX_FILE_BYTES) -> dict:
+    return triage_stream(BytesIO(data), file_name, len(data), max_bytes)
@@ -1,39 +1,226 @@
+import codecs
 import logging
+import mmap
+import threading
+from io import BytesIO
+from itertools import chain
 from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator
+from charset_normalizer import from_bytes
+from charset_normalizer.md import mess_ratio
+
+from app.config import TXT_CHUNK_BYTES, TXT_MMAP_BYTES, TXT_SNIFF_BYTES
 
 logger = logging.getLogger(__name__)
 
-ENCODINGS = ["utf-8", "latin-1", "cp1252"]
+# Longest BOMs first, since the UTF-32 LE mark starts with the UTF-16 LE one
+BOMS = [
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+FALLBACK_ENCODING = "cp1252"
+# cp1252 is kept unless its text is at least this chaotic, as cp1251 or Greek read as cp1252 would be
+FALLBACK_MAX_CHAOS = 0.5
+# Past this many undecodable sequences in one chunk, the rest of the file is read in FALLBACK_ENCODING
+FALLBACK_SWITCH_ERRORS = 100
+
+# cp1252 for bytes that are not valid in the detected encoding, latin-1 for the five it leaves undefined
+_FALLBACK_CHARS = [bytes([b]).decode(FALLBACK_ENCODING, errors="ignore") or chr(b) for b in range(256)]
+_errors = threading.local()
+
+
+def _decode_fallback(error: UnicodeDecodeError) -> tuple[str, int]:
+    _errors.count = getattr(_errors, "count", 0) + 1
+    return "".join(_FALLBACK_CHARS[b] for b in error.object[error.start:error.end]), error.end
+
+
+codecs.register_error("txt_fallback", _decode_fallback)
+
+
+def _windows_code_page_first(match) -> int:
+    if match.encoding == FALLBACK_ENCODING:
+        return 0
+    return 1 if match.encoding.startswith("cp125") else 2
+
+
+def sniff_encoding(prefix: bytes) -> str:
+    """Pick an encoding from a file's first bytes: a BOM, then UTF-8, then cp1252, then statistical detection."""
+    for bom, encoding in BOMS:
+        if prefix.startswith(bom):
+            return encoding
+
+    # NULs are valid UTF-8 but almost always mean BOM-less UTF-16
+    if b"\x00" not in prefix:
+        try:
+            # Not final, so a multi-byte character cut off at the end of the prefix is not an error
+            codecs.getincrementaldecoder("utf-8")().decode(prefix, final=False)
+            return "utf-8"
+        except UnicodeDecodeError:
+            pass
+
+        # Statistical detection guesses rarer code pages for short Western European text, so take
+        # cp1252 whenever it decodes cleanly and reads as plausible text
+        try:
+            if mess_ratio(prefix.decode(FALLBACK_ENCODING), FALLBACK_MAX_CHAOS) < FALLBACK_MAX_CHAOS:
+                return FALLBACK_ENCODING
+        except UnicodeDecodeError:
+            pass
+
+    matches = list(from_bytes(prefix))
+    if not matches:
+        return FALLBACK_ENCODING
+    # Single-byte code pages often tie; prefer the Windows ones that most non-UTF-8 text is written in
+    least_chaos = min(match.chaos for match in matches)
+    candidates = [match for match in matches if match.chaos == least_chaos]
+    return min(candidates, key=_windows_code_page_first).encoding
+
 
+def _iter_chunks(source: Path | BinaryIO, chunk_size: int, use_mmap: bool) -> Iterator[bytes | memoryview]:
+    if isinstance(source, BytesIO):
+        # Slices of the upload's buffer, not copies
+        with source.getbuffer() as buffer:
+            for offset in range(0, len(buffer), chunk_size):
+                yield buffer[offset:offset + chunk_size]
+        return
 
-def extract_text_from_txt(file_path: Path) -> dict:
+    if not isinstance(source, Path):
+        yield from iter(lambda: source.read(chunk_size), b"")
+        return
+
+    with open(source, "rb") as f:
+        if use_mmap and source.stat().st_size:
+            # Whole memory pages, so each chunk can be released once it has been read
+            chunk_size = -(-chunk_size // mmap.PAGESIZE) * mmap.PAGESIZE
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                release = hasattr(mapped, "madvise") and hasattr(mmap, "MADV_DONTNEED")
+                if release:
+                    mapped.madvise(mmap.MADV_SEQUENTIAL)
+                for offset in range(0, len(mapped), chunk_size):
+                    yield mapped[offset:offset + chunk_size]
+                    if release:
+                        # Unmap pages already read so resident memory stays flat; the page cache keeps them
+                        mapped.madvise(mmap.MADV_DONTNEED, offset, min(chunk_size, len(mapped) - offset))
+        else:
+            yield from iter(lambda: f.read(chunk_size), b"")
+
+
+def _decode_chunks(chunks: Iterable[bytes | memoryview], encoding: str) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder(encoding)(errors="txt_fallback")
+    carry = ""
+    for chunk in chain(chunks, [b""]):
+        final = not chunk
+        _errors.count = 0
+        text = carry + decoder.decode(chunk, final=final)
+        if _errors.count > FALLBACK_SWITCH_ERRORS and encoding != FALLBACK_ENCODING:
+            # Typically a log that changes encoding part-way; patching every bad byte would crawl
+            logger.warning(f"Repeated {encoding} decode errors, reading the rest as {FALLBACK_ENCODING}")
+            pending, _ = decoder.getstate()
+            encoding = FALLBACK_ENCODING
+            decoder = codecs.getincrementaldecoder(encoding)(errors="txt_fallback")
+            text += decoder.decode(pending)
+        # Hold back a trailing \r in case the next chunk starts with its \n
+        carry = "\r" if text.endswith("\r") and not final else ""
+        if carry:
+            text = text[:-1]
+        if "\r" in text:
+            # Match the universal newline handling of text-mode open()
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        yield text
+
+
+def open_text(
+    source: Path | BinaryIO,
+    chunk_size: int = TXT_CHUNK_BYTES,
+    use_mmap: bool = False,
+) -> tuple[str, Iterator[str]]:
+    """Sniff the encoding from the first TXT_SNIFF_BYTES and return it with an iterator over the decoded text."""
+    chunks = _iter_chunks(source, chunk_size, use_mmap)
+    head = []
+    head_size = 0
+    for chunk in chunks:
+        head.append(chunk)
+        head_size += len(chunk)
+        if head_size >= TXT_SNIFF_BYTES:
+            break
+    encoding = sniff_encoding(b"".join(head)[:TXT_SNIFF_BYTES])
+    return encoding, _decode_chunks(chain(head, chunks), encoding)
+
+
+def split_lines_into_pages(texts: Iterable[str]) -> Iterator[str]:
+    """Re-cut decoded chunks at their last newline, so no line is split across pages."""
+    carry = ""
+    for text in texts:
+        text = carry + text
+        end = text.rfind("\n") + 1
+        if not end:
+            # No newline in the whole chunk; split here rather than grow without bound
+            end = len(text)
+        carry = text[end:]
+        if text[:end]:
+            yield text[:end]
+    if carry:
+        yield carry
+
+
+def iter_txt_pages(source: Path | BinaryIO, page_size: int = TXT_CHUNK_BYTES) -> Iterator[str]:
+    """Yield the file's text in pages of about `page_size` bytes, memory-mapping files on disk."""
+    _, texts = open_text(source, page_size, use_mmap=True)
+    yield from split_lines_into_pages(texts)
+
+
+def _strip_ends(texts: list[str]) -> None:
+    # Strips the pieces in place, so the joined text is never copied just to trim it
+    for index in range(len(texts)):
+        texts[index] = texts[index].lstrip()
+        if texts[index]:
+            break
+    for index in reversed(range(len(texts))):
+        texts[index] = texts[index].rstrip()
+        if texts[index]:
+            break
+
+
+def extract_text_from_txt(source: Path | BinaryIO, file_name: str | None = None) -> dict:
+    file_name = file_name or source.name
     result = {
-        "file_name": file_path.name,
+        "file_name": file_name,
         "page_count": 1,
         "extraction_method": "plaintext",
         "extracted_text": None,
         "success": False,
     }
 
-    for encoding in ENCODINGS:
-        try:
-            with open(file_path, "r", encoding=encoding) as f:
-                text = f.read().strip()
-
-            if text:
-                result["extracted_text"] = text
-                result["success"] = True
-                logger.info(f"Read {file_path.name} with {encoding} encoding")
-            else:
-                logger.warning(f"Empty file: {file_path.name}")
+    try:
+        paginate = isinstance(source, Path) and source.stat().st_size > TXT_MMAP_BYTES
+        encoding, texts = open_text(source, use_mmap=paginate)
+        page_texts = list(split_lines_into_pages(texts) if paginate else texts)
+    except Exception as e:
+        logger.error(f"Failed to read {file_name}: {e}")
+        return result
 
-            return result
-
-        except UnicodeDecodeError:
-            continue
-        except Exception as e:
-            logger.error(f"Failed to read {file_path.name}: {e}")
-            return result
+    _strip_ends(page_texts)
+    text = "".join(page_texts)
+    if not text:
+        logger.warning(f"Empty file: {file_name}")
+        return result
 
-    logger.error(f"Could not decode {file_path.name} with any encoding")
-    return result
\ No newline at end of file
+    result["extracted_text"] = text
+    result["success"] = True
+    if paginate:
+        pages = []
+        offset = 0
+        for page_number, page_text in enumerate(page_texts, start=1):
+            pages.append({
+                "page_number": page_number,
+                "extraction_method": "plaintext",
+                "start": offset,
+                "end": offset + len(page_text),
+            })
+            offset += len(page_text)
+        result["page_count"] = len(pages)
+        result["pages"] = pages
+    logger.info(f"Read {file_name} with {encoding} encoding")
+    return result
@@ -0,0 +1,94 @@
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+from app.config import DOWNLOAD_CACHE_DB
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS validators (
+    url TEXT PRIMARY KEY,
+    file_path TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS contents (
+    content_hash TEXT PRIMARY KEY,
+    file_path TEXT NOT NULL
+);
+"""
+
+
+class DownloadCache:
+    """HTTP validators per URL and a content-hash index of downloaded files.
+
+    Lets re-crawls send conditional requests and lets identical documents fetched
+    from different URLs share one file on disk.
+    """
+
+    def __init__(self, db_path: Path = DOWNLOAD_CACHE_DB):
+        self.db_path = db_path
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def conditional_headers(self, url: str) -> tuple[dict, Path | None]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM validators WHERE url = ?", (url,)).fetchone()
+        if not row or not Path(row["file_path"]).exists():
+            return {}, None
+
+        headers = {}
+        if row["etag"]:
+            headers["If-None-Match"] = row["etag"]
+        if row["last_modified"]:
+            headers["If-Modified-Since"] = row["last_modified"]
+        return headers, Path(row["file_path"])
+
+    def store(self, url: str, partial_path: Path, output_path: Path, content_hash: str, headers) -> Path:
+        """Move a finished download into place, reusing an existing file with the same content."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT file_path FROM contents WHERE content_hash = ?", (content_hash,)).fetchone()
+            existing = Path(row["file_path"]) if row else None
+
+            if existing and existing != output_path and existing.exists():
+                partial_path.unlink(missing_ok=True)
+                logger.info(f"Duplicate content for {url}, reusing {existing.name}")
+                file_path = existing
+            else:
+                # The file may still hold another version's content; forget that version and any
+                # other URLs validated against it, or they would be served the new bytes
+                conn.execute(
+                    "DELETE FROM contents WHERE file_path = ? AND content_hash != ?",
+                    (str(output_path), content_hash),
+                )
+                conn.execute(
+                    "DELETE FROM validators WHERE file_path = ? AND content_hash != ? AND url != ?",
+                    (str(output_path), content_hash, url),
+                )
+                os.replace(partial_path, output_path)
+                file_path = output_path
+                conn.execute(
+                    "INSERT OR REPLACE INTO contents (content_hash, file_path) VALUES (?, ?)",
+                    (content_hash, str(file_path)),
+                )
+
+            conn.execute(
+                "INSERT OR REPLACE INTO validators (url, file_path, etag, last_modified, content_hash, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, str(file_path), headers.get("ETag"), headers.get("Last-Modified"), content_hash, time.time()),
+            )
+        return file_path
+
+    def touch(self, url: str) -> None:
+        with self._connect() as conn:
+            conn.execute("UPDATE validators SET updated_at = ? WHERE url = ?", (time.time(), url))
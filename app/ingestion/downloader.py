@@ -1,14 +1,27 @@
+import asyncio
 import logging
+import os
 import time
 import hashlib
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from pathlib import Path
+from typing import Iterable, Iterator
 from urllib.parse import urlparse
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
 
-from app.config import RAW_DIR, DOWNLOAD_TIMEOUT, MAX_RETRIES
+from app.config import RAW_DIR, DOWNLOAD_TIMEOUT, MAX_RETRIES, DOWNLOAD_WORKERS, DOWNLOAD_PER_HOST
+from app.ingestion.download_cache import DownloadCache
+from app.metrics import DOWNLOAD_BYTES, DOWNLOAD_SECONDS
 
 logger = logging.getLogger(__name__)
 
+# Bigger than the sync path's chunks, since each write is handed to a thread
+ASYNC_WRITE_BYTES = 256 * 1024
+
 
 def get_filename_from_url(url: str) -> str:
     parsed = urlparse(url)
@@ -19,6 +32,16 @@ def get_filename_from_url(url: str) -> str:
     return name
 
 
+def get_partial_path(output_path: Path) -> Path:
+    return output_path.with_name(f".{output_path.name}.{os.getpid()}.{threading.get_ident()}.part")
+
+
+def observe_download(start: float, outcome: str, file_path: Path | None = None) -> None:
+    DOWNLOAD_SECONDS.observe(time.perf_counter() - start, outcome=outcome)
+    if file_path is not None:
+        DOWNLOAD_BYTES.observe(file_path.stat().st_size)
+
+
 def validate_pdf_url(url: str, timeout: int = 10) -> bool:
     try:
         resp = requests.head(url, timeout=timeout, allow_redirects=True)
@@ -28,39 +51,214 @@ def validate_pdf_url(url: str, timeout: int = 10) -> bool:
         return False
 
 
-def download_pdf(url: str, output_dir: Path = RAW_DIR) -> Path | None:
+def finish_download(
+    url: str,
+    partial_path: Path,
+    output_path: Path,
+    content_hash: str,
+    headers,
+    cache: DownloadCache | None,
+) -> Path:
+    if cache:
+        return cache.store(url, partial_path, output_path, content_hash, headers)
+    os.replace(partial_path, output_path)
+    return output_path
+
+
+def _lookup_existing(url: str, output_path: Path, cache: DownloadCache | None) -> tuple[dict, Path | None]:
+    headers, cached_path = cache.conditional_headers(url) if cache else ({}, None)
+    if not headers and not cached_path and output_path.exists():
+        cached_path = output_path
+    return headers, cached_path
+
+
+async def download_pdf_async(
+    url: str,
+    output_dir: Path = RAW_DIR,
+    client: httpx.AsyncClient | None = None,
+    cache: DownloadCache | None = None,
+) -> Path | None:
+    start = time.perf_counter()
     filename = get_filename_from_url(url)
     output_path = output_dir / filename
 
-    if output_path.exists():
-        logger.info(f"Already downloaded: {filename}")
-        return output_path
+    # SQLite lookups, file writes and renames all run in threads so the event loop keeps serving requests
+    headers, cached_path = await asyncio.to_thread(_lookup_existing, url, output_path, cache)
+    if not headers and cached_path:
+        logger.info(f"Already downloaded: {cached_path.name}")
+        observe_download(start, "cached")
+        return cached_path
+
+    partial_path = get_partial_path(output_path)
+    http = client or httpx.AsyncClient(follow_redirects=True)
+    try:
+        for attempt in range(MAX_RETRIES):
+            try:
+                async with http.stream("GET", url, timeout=DOWNLOAD_TIMEOUT, headers=headers) as resp:
+                    if resp.status_code == 304:
+                        await asyncio.to_thread(cache.touch, url)
+                        logger.info(f"Not modified: {cached_path.name}")
+                        observe_download(start, "not_modified")
+                        return cached_path
+                    resp.raise_for_status()
+
+                    digest = hashlib.sha256()
+                    f = await asyncio.to_thread(open, partial_path, "wb")
+                    try:
+                        async for chunk in resp.aiter_bytes(chunk_size=ASYNC_WRITE_BYTES):
+                            await asyncio.to_thread(f.write, chunk)
+                            digest.update(chunk)
+                    finally:
+                        await asyncio.to_thread(f.close)
+
+                file_path = await asyncio.to_thread(
+                    finish_download, url, partial_path, output_path, digest.hexdigest(), resp.headers, cache
+                )
+                logger.info(f"Downloaded: {filename}")
+                observe_download(start, "downloaded", file_path)
+                return file_path
+
+            except httpx.HTTPError as e:
+                await asyncio.to_thread(partial_path.unlink, missing_ok=True)
+                wait_time = 2 ** attempt
+                logger.warning(f"Attempt {attempt + 1} failed for {url}: {e}")
+                if attempt < MAX_RETRIES - 1:
+                    await asyncio.sleep(wait_time)
+    finally:
+        if client is None:
+            await http.aclose()
+
+    logger.error(f"Failed to download after {MAX_RETRIES} attempts: {url}")
+    observe_download(start, "failed")
+    return None
 
+
+def create_session(pool_size: int = DOWNLOAD_WORKERS) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def download_pdf(
+    url: str,
+    output_dir: Path = RAW_DIR,
+    session: requests.Session | None = None,
+    cache: DownloadCache | None = None,
+) -> Path | None:
+    http = session or requests
+    start = time.perf_counter()
+    filename = get_filename_from_url(url)
+    output_path = output_dir / filename
+
+    headers, cached_path = cache.conditional_headers(url) if cache else ({}, None)
+    if not headers:
+        existing = cached_path or (output_path if output_path.exists() else None)
+        if existing:
+            logger.info(f"Already downloaded: {existing.name}")
+            observe_download(start, "cached")
+            return existing
+
+    partial_path = get_partial_path(output_path)
     for attempt in range(MAX_RETRIES):
         try:
-            resp = requests.get(url, timeout=DOWNLOAD_TIMEOUT, stream=True)
+            resp = http.get(url, timeout=DOWNLOAD_TIMEOUT, stream=True, headers=headers)
+            if resp.status_code == 304:
+                resp.close()
+                cache.touch(url)
+                logger.info(f"Not modified: {cached_path.name}")
+                observe_download(start, "not_modified")
+                return cached_path
             resp.raise_for_status()
 
-            with open(output_path, "wb") as f:
+            digest = hashlib.sha256()
+            with open(partial_path, "wb") as f:
                 for chunk in resp.iter_content(chunk_size=8192):
                     f.write(chunk)
+                    digest.update(chunk)
 
+            file_path = finish_download(url, partial_path, output_path, digest.hexdigest(), resp.headers, cache)
             logger.info(f"Downloaded: {filename}")
-            return output_path
+            observe_download(start, "downloaded", file_path)
+            return file_path
 
         except requests.RequestException as e:
+            partial_path.unlink(missing_ok=True)
             wait_time = 2 ** attempt
             logger.warning(f"Attempt {attempt + 1} failed for {url}: {e}")
             if attempt < MAX_RETRIES - 1:
                 time.sleep(wait_time)
 
     logger.error(f"Failed to download after {MAX_RETRIES} attempts: {url}")
+    observe_download(start, "failed")
     return None
 
 
+def download_concurrent(
+    urls: Iterable[str],
+    output_dir: Path = RAW_DIR,
+    workers: int = DOWNLOAD_WORKERS,
+    per_host: int = DOWNLOAD_PER_HOST,
+    cache: DownloadCache | None = None,
+) -> Iterator[tuple[str, Path | None]]:
+    """Download URLs on a thread pool, at most `per_host` at a time per host.
+
+    The per-host limit is applied before work is submitted, so URLs for a busy host wait here
+    instead of occupying pool threads that could be downloading from other hosts.
+    """
+    seen = set()
+    pending = {}
+    in_flight = defaultdict(int)
+    # host -> URLs held back because that host is at its limit
+    waiting = defaultdict(deque)
+    held = 0
+    url_iter = iter(urls)
+    exhausted = False
+
+    with create_session(workers) as session, ThreadPoolExecutor(max_workers=workers) as executor:
+
+        def start(url: str) -> None:
+            in_flight[urlparse(url).netloc] += 1
+            pending[executor.submit(download_pdf, url, output_dir, session=session, cache=cache)] = url
+
+        while True:
+            for host in list(waiting):
+                queue = waiting[host]
+                while queue and in_flight[host] < per_host and len(pending) < workers:
+                    start(queue.popleft())
+                    held -= 1
+                if not queue:
+                    del waiting[host]
+
+            # Bound the backlog, so one dominant host cannot pull the whole URL list into memory
+            while not exhausted and len(pending) < workers and held < workers * 4:
+                url = next(url_iter, None)
+                if url is None:
+                    exhausted = True
+                elif url not in seen:
+                    seen.add(url)
+                    host = urlparse(url).netloc
+                    if in_flight[host] < per_host:
+                        start(url)
+                    else:
+                        waiting[host].append(url)
+                        held += 1
+
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                url = pending.pop(future)
+                in_flight[urlparse(url).netloc] -= 1
+                try:
+                    yield url, future.result()
+                except Exception as e:
+                    logger.error(f"Download worker failed for {url}: {e}")
+                    yield url, None
+
+
 def download_batch(urls: list[str]) -> list[tuple[str, Path | None]]:
-    results = []
-    for url in urls:
-        path = download_pdf(url)
-        results.append((url, path))
-    return results
\ No newline at end of file
+    paths = dict(download_concurrent(urls))
+    return [(url, paths.get(url)) for url in urls]
@@ -0,0 +1,114 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from app.config import MANIFEST_DB, RESULTS_DIR
+from app.extraction.cache import hash_file
+from app.ingestion.downloader import get_filename_from_url
+
+logger = logging.getLogger(__name__)
+
+DOWNLOADED = "downloaded"
+DONE = "done"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    url TEXT PRIMARY KEY,
+    file_path TEXT,
+    content_hash TEXT,
+    download_status TEXT,
+    extraction_status TEXT,
+    result_ref TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+class Manifest:
+    """Per-URL download and extraction state for resumable CLI runs."""
+
+    def __init__(self, db_path: Path = MANIFEST_DB, results_dir: Path = RESULTS_DIR):
+        self.db_path = db_path
+        self.results_dir = results_dir
+        with self._connect() as conn:
+            conn.execute(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def get(self, url: str) -> dict | None:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM urls WHERE url = ?", (url,)).fetchone()
+        return dict(row) if row else None
+
+    def _upsert(self, url: str, **fields) -> None:
+        fields["updated_at"] = time.time()
+        columns = ", ".join(fields)
+        placeholders = ", ".join("?" for _ in fields)
+        updates = ", ".join(f"{name} = excluded.{name}" for name in fields)
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT INTO urls (url, {columns}) VALUES (?, {placeholders}) "
+                f"ON CONFLICT(url) DO UPDATE SET {updates}",
+                (url, *fields.values()),
+            )
+
+    def completed_result(self, url: str) -> dict | None:
+        entry = self.get(url)
+        if not entry or entry["extraction_status"] != DONE or not entry["result_ref"]:
+            return None
+
+        try:
+            with open(self.results_dir / entry["result_ref"], "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def discard_unverified(self, url: str, output_dir: Path) -> None:
+        """Remove a previously downloaded file for `url` unless it matches the recorded hash."""
+        file_path = output_dir / get_filename_from_url(url)
+        if not file_path.exists():
+            return
+
+        entry = self.get(url)
+        if entry and entry["content_hash"] and hash_file(file_path) == entry["content_hash"]:
+            return
+
+        logger.info(f"Discarding unverified download: {file_path.name}")
+        file_path.unlink(missing_ok=True)
+
+    def record_download(self, url: str, file_path: Path | None) -> str | None:
+        entry = self.get(url)
+        attempts = (entry["attempts"] if entry else 0) + 1
+
+        if not file_path:
+            self._upsert(url, download_status=FAILED, attempts=attempts)
+            return None
+
+        content_hash = hash_file(file_path)
+        fields = {"file_path": str(file_path), "content_hash": content_hash, "download_status": DOWNLOADED}
+        if entry and entry["content_hash"] != content_hash:
+            fields.update(extraction_status=None, result_ref=None)
+        self._upsert(url, attempts=attempts, **fields)
+        return content_hash
+
+    def record_extraction(self, url: str, content_hash: str, result: dict) -> None:
+        if not result.get("success"):
+            self._upsert(url, extraction_status=FAILED)
+            return
+
+        result_ref = f"{content_hash}.json"
+        result_path = self.results_dir / result_ref
+        tmp_path = result_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False)
+        os.replace(tmp_path, result_path)
+        self._upsert(url, extraction_status=DONE, result_ref=result_ref)
@@ -1,10 +1,39 @@
+import importlib.util
 import logging
-from urllib.parse import urljoin, urlparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Iterable, Iterator
+from urllib.parse import urljoin, urlparse, urldefrag
+from urllib.robotparser import RobotFileParser
 import requests
 from bs4 import BeautifulSoup
 
+from app.config import CRAWL_DELAY, CRAWL_MAX_PAGES, CRAWL_WORKERS
+from app.ingestion.downloader import create_session
+
 logger = logging.getLogger(__name__)
 
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+USER_AGENT = "document-ingestion-crawler/1.0"
+
+
+def parse_links(content: bytes, page_url: str) -> tuple[list[str], list[str]]:
+    soup = BeautifulSoup(content, HTML_PARSER)
+    pdf_links = set()
+    page_links = set()
+
+    for anchor in soup.find_all("a", href=True):
+        full_url, _ = urldefrag(urljoin(page_url, anchor["href"]))
+        if urlparse(full_url).scheme not in ("http", "https"):
+            continue
+        if full_url.lower().endswith(".pdf"):
+            pdf_links.add(full_url)
+        else:
+            page_links.add(full_url)
+
+    return list(pdf_links), list(page_links)
+
 
 def extract_pdf_links(page_url: str, timeout: int = 15) -> list[str]:
     try:
@@ -14,17 +43,9 @@ def extract_pdf_links(page_url: str, timeout: int = 15) -> list[str]:
         logger.error(f"Failed to fetch {page_url}: {e}")
         return []
 
-    soup = BeautifulSoup(resp.content, "html.parser")
-    pdf_links = []
-
-    for anchor in soup.find_all("a", href=True):
-        href = anchor["href"]
-        if href.lower().endswith(".pdf"):
-            full_url = urljoin(page_url, href)
-            pdf_links.append(full_url)
-
+    pdf_links, _ = parse_links(resp.content, page_url)
     logger.info(f"Found {len(pdf_links)} PDF links on {page_url}")
-    return list(set(pdf_links))
+    return pdf_links
 
 
 def discover_pdfs_from_pages(page_urls: list[str]) -> list[dict]:
@@ -37,4 +58,119 @@ def discover_pdfs_from_pages(page_urls: list[str]) -> list[dict]:
                 "source_url": url,
                 "pdf_url": pdf_url,
             })
-    return results
\ No newline at end of file
+    return results
+
+
+class RobotsPolicy:
+    """Caches robots.txt per host and spaces out requests to each host."""
+
+    def __init__(self, session: requests.Session, delay: float = CRAWL_DELAY, timeout: int = 10):
+        self.session = session
+        self.delay = delay
+        self.timeout = timeout
+        self._robots = {}
+        self._next_allowed = {}
+        self._lock = threading.Lock()
+
+    def _parser(self, url: str) -> RobotFileParser:
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        with self._lock:
+            parser = self._robots.get(origin)
+        if parser:
+            return parser
+
+        parser = RobotFileParser()
+        try:
+            resp = self.session.get(f"{origin}/robots.txt", timeout=self.timeout)
+            parser.parse(resp.text.splitlines() if resp.ok else [])
+        except requests.RequestException:
+            parser.parse([])
+
+        with self._lock:
+            return self._robots.setdefault(origin, parser)
+
+    def allowed(self, url: str) -> bool:
+        return self._parser(url).can_fetch(USER_AGENT, url)
+
+    def wait(self, url: str) -> None:
+        delay = max(self.delay, self._parser(url).crawl_delay(USER_AGENT) or 0)
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_allowed.get(host, now))
+            self._next_allowed[host] = start + delay
+        if start > now:
+            time.sleep(start - now)
+
+
+def crawl_for_pdfs(
+    start_urls: Iterable[str],
+    max_depth: int = 0,
+    same_domain: bool = True,
+    workers: int = CRAWL_WORKERS,
+    max_pages: int = CRAWL_MAX_PAGES,
+    delay: float = CRAWL_DELAY,
+    timeout: int = 15,
+) -> Iterator[dict]:
+    """Crawl pages breadth-first up to `max_depth` links away, yielding PDF links as they are found."""
+    start_urls = [urldefrag(url)[0] for url in start_urls]
+    allowed_hosts = {urlparse(url).netloc for url in start_urls}
+    visited = set(start_urls)
+    seen_pdfs = set()
+    pages_fetched = 0
+
+    with create_session(workers) as session, ThreadPoolExecutor(max_workers=workers) as executor:
+        session.headers["User-Agent"] = USER_AGENT
+        policy = RobotsPolicy(session, delay=delay)
+
+        def fetch(page_url: str) -> tuple[list[str], list[str]]:
+            if not policy.allowed(page_url):
+                logger.info(f"Disallowed by robots.txt: {page_url}")
+                return [], []
+            policy.wait(page_url)
+            try:
+                resp = session.get(page_url, timeout=timeout)
+                resp.raise_for_status()
+            except requests.RequestException as e:
+                logger.error(f"Failed to fetch {page_url}: {e}")
+                return [], []
+            if "html" not in resp.headers.get("Content-Type", "text/html"):
+                return [], []
+            pdf_links, page_links = parse_links(resp.content, page_url)
+            # PDF links go straight to the downloader, so they get the same checks as pages before a fetch
+            pdf_links = [
+                url for url in pdf_links
+                if (not same_domain or urlparse(url).netloc in allowed_hosts) and policy.allowed(url)
+            ]
+            return pdf_links, page_links
+
+        pending = {executor.submit(fetch, url): (url, 0) for url in start_urls}
+        pages_fetched = len(pending)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                page_url, depth = pending.pop(future)
+                try:
+                    pdf_links, page_links = future.result()
+                except Exception as e:
+                    logger.error(f"Crawl worker failed for {page_url}: {e}")
+                    continue
+
+                new_pdfs = [url for url in pdf_links if url not in seen_pdfs]
+                logger.info(f"Found {len(new_pdfs)} new PDF links on {page_url}")
+                for pdf_url in new_pdfs:
+                    seen_pdfs.add(pdf_url)
+                    yield {"source_type": "web_page", "source_url": page_url, "pdf_url": pdf_url}
+
+                if depth >= max_depth:
+                    continue
+                for link in page_links:
+                    if link in visited or pages_fetched >= max_pages:
+                        continue
+                    if same_domain and urlparse(link).netloc not in allowed_hosts:
+                        continue
+                    visited.add(link)
+                    pages_fetched += 1
+                    pending[executor.submit(fetch, link)] = (link, depth + 1)
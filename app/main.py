@@ -1,14 +1,33 @@
 import argparse
 import logging
 import sys
+from collections import deque
+from contextlib import ExitStack
 from pathlib import Path
+from typing import Iterable, Iterator
 
-from app.config import RAW_DIR, LOG_LEVEL, LOGS_DIR
+from app.config import (
+    RAW_DIR,
+    LOG_LEVEL,
+    LOGS_DIR,
+    CACHE_ENABLED,
+    DOWNLOAD_CACHE_ENABLED,
+    DOWNLOAD_WORKERS,
+    EXTRACT_WORKERS,
+    PIPELINE_QUEUE_SIZE,
+    EXPORT_ROTATE_RECORDS,
+    EXPORT_ROTATE_BYTES,
+)
 from app.ingestion.url_sources import load_urls_from_file, search_pdfs
-from app.ingestion.pdf_discovery import discover_pdfs_from_pages
-from app.ingestion.downloader import download_pdf
+from app.ingestion.pdf_discovery import crawl_for_pdfs
+from app.ingestion.downloader import download_concurrent
+from app.ingestion.download_cache import DownloadCache
+from app.ingestion.manifest import Manifest
 from app.extraction.extractor import extract_text, get_supported_extensions
-from app.export.exporter import export_to_json, export_to_csv
+from app.extraction.cache import get_cache_stats
+from app.export.exporter import STREAM_WRITERS
+from app.metrics import format_summary
+from app.pipeline import run_pipeline
 
 logging.basicConfig(
     level=getattr(logging, LOG_LEVEL),
@@ -21,55 +40,172 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def process_local_files(paths: list[str]) -> list[dict]:
-    results = []
+def process_local_files(paths: list[str], use_cache: bool = CACHE_ENABLED) -> Iterator[dict]:
     for path_str in paths:
         path = Path(path_str)
         if not path.exists():
             logger.warning(f"File not found: {path}")
             continue
 
-        result = extract_text(path)
+        result = extract_text(path, use_cache=use_cache)
         result["source_type"] = "local"
         result["source_url"] = None
         result["pdf_url"] = None
-        results.append(result)
+        yield result
 
-    return results
 
+def fetch_and_extract(
+    urls: Iterable[str],
+    use_cache: bool = CACHE_ENABLED,
+    manifest: Manifest | None = None,
+    download_cache: DownloadCache | None = None,
+) -> Iterator[tuple[str, dict]]:
+    # URLs are pulled lazily so discovery can feed downloads as it goes; results
+    # already in the manifest are re-read when drained instead of held in memory.
+    completed = deque()
 
-def process_urls(urls: list[str]) -> list[dict]:
-    results = []
-    for url in urls:
-        file_path = download_pdf(url)
+    def pending() -> Iterator[str]:
+        for url in urls:
+            # With the download cache, completed URLs are still revalidated; a 304 costs next to nothing
+            if manifest and not download_cache and manifest.completed_result(url) is not None:
+                completed.append(url)
+                continue
+            if manifest:
+                manifest.discard_unverified(url, RAW_DIR)
+            yield url
+
+    def drain_completed() -> Iterator[tuple[str, dict]]:
+        while completed:
+            url = completed.popleft()
+            stored = manifest.completed_result(url)
+            if stored:
+                logger.info(f"Already extracted: {url}")
+                yield url, stored
+
+    for url, file_path in download_concurrent(pending(), cache=download_cache):
+        yield from drain_completed()
+        content_hash = manifest.record_download(url, file_path) if manifest else None
+        # record_download forgets the stored result when the content changed
+        stored = manifest.completed_result(url) if manifest else None
+        if stored:
+            if file_path:
+                logger.info(f"Unchanged since it was extracted: {url}")
+            else:
+                logger.warning(f"Download failed, reusing the last result: {url}")
+            yield url, stored
+            continue
         if not file_path:
             continue
 
-        result = extract_text(file_path)
+        result = extract_text(file_path, use_cache=use_cache)
+        if manifest:
+            manifest.record_extraction(url, content_hash, result)
+        yield url, result
+
+    yield from drain_completed()
+
+
+def process_urls(
+    urls: list[str],
+    use_cache: bool = CACHE_ENABLED,
+    manifest: Manifest | None = None,
+    download_cache: DownloadCache | None = None,
+) -> Iterator[dict]:
+    for url, result in fetch_and_extract(urls, use_cache, manifest, download_cache):
         result["source_type"] = "url"
         result["source_url"] = url
         result["pdf_url"] = url
-        results.append(result)
+        yield result
 
-    return results
 
+def process_web_pages(
+    page_urls: list[str],
+    use_cache: bool = CACHE_ENABLED,
+    manifest: Manifest | None = None,
+    download_cache: DownloadCache | None = None,
+    max_depth: int = 0,
+    same_domain: bool = True,
+) -> Iterator[dict]:
+    discoveries = {}
 
-def process_web_pages(page_urls: list[str]) -> list[dict]:
-    discoveries = discover_pdfs_from_pages(page_urls)
-    results = []
+    def pdf_urls() -> Iterator[str]:
+        for item in crawl_for_pdfs(page_urls, max_depth=max_depth, same_domain=same_domain):
+            discoveries[item["pdf_url"]] = item
+            yield item["pdf_url"]
 
-    for item in discoveries:
-        file_path = download_pdf(item["pdf_url"])
-        if not file_path:
-            continue
-
-        result = extract_text(file_path)
+    for pdf_url, result in fetch_and_extract(pdf_urls(), use_cache, manifest, download_cache):
+        item = discoveries.pop(pdf_url)
         result["source_type"] = item["source_type"]
         result["source_url"] = item["source_url"]
         result["pdf_url"] = item["pdf_url"]
-        results.append(result)
+        yield result
+
+
+def iter_results(
+    args: argparse.Namespace,
+    use_cache: bool,
+    manifest: Manifest | None = None,
+    download_cache: DownloadCache | None = None,
+) -> Iterator[dict]:
+    if args.files:
+        logger.info(f"Processing {len(args.files)} local files")
+        yield from process_local_files(args.files, use_cache=use_cache)
+
+    if args.urls:
+        logger.info(f"Processing {len(args.urls)} URLs")
+        yield from process_urls(args.urls, use_cache=use_cache, manifest=manifest, download_cache=download_cache)
+
+    if args.url_file:
+        urls = load_urls_from_file(args.url_file)
+        logger.info(f"Processing {len(urls)} URLs from file")
+        yield from process_urls(urls, use_cache=use_cache, manifest=manifest, download_cache=download_cache)
+
+    if args.pages:
+        logger.info(f"Scanning {len(args.pages)} web pages for documents")
+        yield from process_web_pages(
+            args.pages,
+            use_cache=use_cache,
+            manifest=manifest,
+            download_cache=download_cache,
+            max_depth=args.crawl_depth,
+            same_domain=not args.any_domain,
+        )
+
+    if args.search:
+        urls = search_pdfs(args.search)
+        logger.info(f"Processing {len(urls)} search results")
+        yield from process_urls(urls, use_cache=use_cache, manifest=manifest, download_cache=download_cache)
 
-    return results
+
+def iter_sources(args: argparse.Namespace) -> Iterator[dict]:
+    for path_str in args.files or []:
+        path = Path(path_str)
+        if not path.exists():
+            logger.warning(f"File not found: {path}")
+            continue
+        yield {"source_type": "local", "source_url": None, "pdf_url": None, "file_path": path}
+
+    urls = list(args.urls or [])
+    if args.url_file:
+        urls.extend(load_urls_from_file(args.url_file))
+    for url in urls:
+        yield {"source_type": "url", "source_url": url, "pdf_url": url}
+
+    if args.pages:
+        yield from crawl_for_pdfs(args.pages, max_depth=args.crawl_depth, same_domain=not args.any_domain)
+
+    if args.search:
+        for url in search_pdfs(args.search):
+            yield {"source_type": "url", "source_url": url, "pdf_url": url}
+
+
+def open_writers(args: argparse.Namespace, stack: ExitStack) -> list:
+    formats = ["json", "csv"] if args.output == "both" else [args.output]
+    rotate_bytes = args.rotate_mb * 1024 * 1024 if args.rotate_mb is not None else EXPORT_ROTATE_BYTES
+    return [
+        stack.enter_context(STREAM_WRITERS[fmt](max_records=args.rotate_records, max_bytes=rotate_bytes))
+        for fmt in formats
+    ]
 
 
 def main():
@@ -78,8 +214,18 @@ def main():
     parser.add_argument("--urls", nargs="+", help="Direct URLs to documents")
     parser.add_argument("--url-file", help="File containing URLs (one per line)")
     parser.add_argument("--pages", nargs="+", help="Web pages to scan for PDF links")
+    parser.add_argument("--crawl-depth", type=int, default=0, help="Follow links from --pages up to N levels deep")
+    parser.add_argument("--any-domain", action="store_true", help="Let the crawler follow links to other domains")
     parser.add_argument("--search", help="Search query for PDF discovery")
-    parser.add_argument("--output", choices=["json", "csv", "both"], default="both")
+    parser.add_argument("--output", choices=["json", "csv", "jsonl", "parquet", "both"], default="both")
+    parser.add_argument("--rotate-records", type=int, default=EXPORT_ROTATE_RECORDS, help="Start a new output file every N records")
+    parser.add_argument("--rotate-mb", type=int, help="Start a new output file once the current one reaches N MB")
+    parser.add_argument("--no-cache", action="store_true", help="Re-extract documents even if a cached result exists")
+    parser.add_argument("--incremental", action="store_true", help="Skip URLs already downloaded and extracted by a previous run")
+    parser.add_argument("--pipeline", action="store_true", help="Overlap download, extraction and export stages")
+    parser.add_argument("--download-workers", type=int, default=DOWNLOAD_WORKERS)
+    parser.add_argument("--extract-workers", type=int, default=EXTRACT_WORKERS)
+    parser.add_argument("--queue-size", type=int, default=PIPELINE_QUEUE_SIZE, help="Bound on items waiting between stages")
 
     args = parser.parse_args()
 
@@ -87,43 +233,44 @@ def main():
         parser.print_help()
         sys.exit(1)
 
-    all_results = []
+    use_cache = CACHE_ENABLED and not args.no_cache
+    manifest = Manifest() if args.incremental else None
+    download_cache = DownloadCache() if DOWNLOAD_CACHE_ENABLED else None
 
-    if args.files:
-        logger.info(f"Processing {len(args.files)} local files")
-        all_results.extend(process_local_files(args.files))
-
-    if args.urls:
-        logger.info(f"Processing {len(args.urls)} URLs")
-        all_results.extend(process_urls(args.urls))
-
-    if args.url_file:
-        urls = load_urls_from_file(args.url_file)
-        logger.info(f"Processing {len(urls)} URLs from file")
-        all_results.extend(process_urls(urls))
-
-    if args.pages:
-        logger.info(f"Scanning {len(args.pages)} web pages for documents")
-        all_results.extend(process_web_pages(args.pages))
+    processed = successful = 0
+    with ExitStack() as stack:
+        writers = open_writers(args, stack)
 
-    if args.search:
-        urls = search_pdfs(args.search)
-        logger.info(f"Processing {len(urls)} search results")
-        all_results.extend(process_urls(urls))
+        if args.pipeline:
+            processed, successful = run_pipeline(
+                iter_sources(args),
+                [writer.write for writer in writers],
+                download_workers=args.download_workers,
+                extract_workers=args.extract_workers,
+                queue_size=args.queue_size,
+                use_cache=use_cache,
+                manifest=manifest,
+                download_cache=download_cache,
+            )
+        else:
+            for record in iter_results(args, use_cache, manifest, download_cache):
+                for writer in writers:
+                    writer.write(record)
+                processed += 1
+                successful += bool(record.get("success"))
 
-    if not all_results:
+    if not processed:
         logger.warning("No documents processed")
         sys.exit(0)
 
-    if args.output in ("json", "both"):
-        export_to_json(all_results)
+    logger.info(f"Processed {processed} documents")
+    logger.info(f"Successful extractions: {successful}/{processed}")
 
-    if args.output in ("csv", "both"):
-        export_to_csv(all_results)
+    if use_cache and not args.pipeline:
+        stats = get_cache_stats()
+        logger.info(f"Extraction cache: {stats['hits']} hits, {stats['misses']} misses")
 
-    logger.info(f"Processed {len(all_results)} documents")
-    successful = sum(1 for r in all_results if r.get("success"))
-    logger.info(f"Successful extractions: {successful}/{len(all_results)}")
+    logger.info("Stage timings:\n" + format_summary())
 
 
 if __name__ == "__main__":
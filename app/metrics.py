@@ -0,0 +1,195 @@
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+BYTES_BUCKETS = (1024, 10 * 1024, 100 * 1024, 1024 ** 2, 10 * 1024 ** 2, 100 * 1024 ** 2, 1024 ** 3)
+PAGES_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+_lock = threading.Lock()
+_registry = {}
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self.values = {}
+        _registry[name] = self
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(str(labels.get(label, "")) for label in self.labelnames)
+        with _lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def _samples(self) -> Iterator[tuple[str, tuple, float]]:
+        for key, value in sorted(self.values.items()):
+            yield self.name, key, value
+
+    def _merge(self, values: dict) -> None:
+        for key, value in values.items():
+            self.values[key] = self.values.get(key, 0) + value
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = (), buckets: tuple = DURATION_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets) + (math.inf,)
+        # key -> [per-bucket counts, sum, count, max]
+        self.values = {}
+        _registry[name] = self
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(str(labels.get(label, "")) for label in self.labelnames)
+        with _lock:
+            entry = self.values.get(key)
+            if entry is None:
+                entry = self.values[key] = [[0] * len(self.buckets), 0.0, 0, 0.0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][index] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+            entry[3] = max(entry[3], value)
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self) -> Iterator[tuple[str, tuple, float]]:
+        for key, (counts, total, count, _) in sorted(self.values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == math.inf else repr(float(bound))
+                yield f"{self.name}_bucket", key + (("le", le),), cumulative
+            yield f"{self.name}_sum", key, total
+            yield f"{self.name}_count", key, count
+
+    def _merge(self, values: dict) -> None:
+        for key, (counts, total, count, peak) in values.items():
+            entry = self.values.setdefault(key, [[0] * len(self.buckets), 0.0, 0, 0.0])
+            entry[0] = [a + b for a, b in zip(entry[0], counts)]
+            entry[1] += total
+            entry[2] += count
+            entry[3] = max(entry[3], peak)
+
+
+DOWNLOAD_SECONDS = Histogram("download_duration_seconds", "Time to download one document", ("outcome",))
+DOWNLOAD_BYTES = Histogram("download_size_bytes", "Size of downloaded documents", buckets=BYTES_BUCKETS)
+EXTRACT_SECONDS = Histogram("extract_duration_seconds", "Time spent in one extractor call", ("extractor", "outcome"))
+EXTRACT_BYTES = Histogram("extract_input_bytes", "Size of documents passed to an extractor", ("extractor",), BYTES_BUCKETS)
+EXTRACT_PAGES = Histogram("extract_pages", "Pages per extracted document", ("extractor",), PAGES_BUCKETS)
+OCR_SECONDS = Histogram("ocr_window_duration_seconds", "Time per OCR window, by phase", ("phase",))
+OCR_PAGES = Counter("ocr_pages_total", "Pages or frames sent to Tesseract")
+OCR_FALLBACK_PAGES = Counter("ocr_fallback_pages_total", "PDF pages routed to OCR because they had too little text")
+OCR_FALLBACK_DOCUMENTS = Counter("ocr_fallback_documents_total", "PDFs with at least one page routed to OCR")
+EXPORT_SECONDS = Histogram("export_write_duration_seconds", "Time to write one record", ("format",))
+EXPORT_RECORDS = Counter("export_records_total", "Records written by exporters", ("format",))
+EXPORT_BYTES = Counter("export_bytes_total", "Bytes written by exporters", ("format",))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames: tuple[str, ...], key: tuple) -> str:
+    # Histogram bucket samples carry an extra ("le", bound) pair after the metric's own labels
+    pairs = list(zip(labelnames, key[:len(labelnames)])) + list(key[len(labelnames):])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render() -> str:
+    """Return every metric in the Prometheus text exposition format."""
+    lines = []
+    with _lock:
+        for metric in _registry.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, key, value in metric._samples():
+                lines.append(f"{name}{_format_labels(metric.labelnames, key)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def snapshot_and_reset() -> dict:
+    with _lock:
+        snapshot = {name: metric.values for name, metric in _registry.items() if metric.values}
+        for metric in _registry.values():
+            metric.values = {}
+    return snapshot
+
+
+def merge(snapshot: dict) -> None:
+    with _lock:
+        for name, values in snapshot.items():
+            _registry[name]._merge(values)
+
+
+def run_collecting(func: Callable, *args, **kwargs) -> tuple:
+    """Run `func` in a pool worker and return its result with the metrics it recorded, for `merge` in the parent."""
+    snapshot_and_reset()
+    result = func(*args, **kwargs)
+    return result, snapshot_and_reset()
+
+
+def summary_rows() -> list[dict]:
+    rows = []
+    with _lock:
+        for metric in _registry.values():
+            if not metric.name.endswith("_seconds"):
+                continue
+            stage = metric.name.removesuffix("_duration_seconds")
+            for key, (_, total, count, peak) in sorted(metric.values.items()):
+                labels = ",".join(value for value in key if value)
+                rows.append({
+                    "stage": f"{stage}[{labels}]" if labels else stage,
+                    "count": count,
+                    "total_s": total,
+                    "mean_ms": total / count * 1000 if count else 0.0,
+                    "max_ms": peak * 1000,
+                })
+        counters = [
+            (metric.name, key, value)
+            for metric in _registry.values() if metric.kind == "counter"
+            for key, value in sorted(metric.values.items())
+        ]
+    for name, key, value in counters:
+        labels = ",".join(part for part in key if part)
+        rows.append({"stage": f"{name}[{labels}]" if labels else name, "count": value})
+    return rows
+
+
+def format_summary() -> str:
+    rows = summary_rows()
+    if not rows:
+        return "No metrics recorded"
+    width = max(len(row["stage"]) for row in rows)
+    lines = [f"{'stage':<{width}}  {'count':>8}  {'total s':>9}  {'mean ms':>9}  {'max ms':>9}"]
+    for row in rows:
+        if "total_s" in row:
+            lines.append(
+                f"{row['stage']:<{width}}  {row['count']:>8}  {row['total_s']:>9.2f}  {row['mean_ms']:>9.1f}  {row['max_ms']:>9.1f}"
+            )
+        else:
+            lines.append(f"{row['stage']:<{width}}  {row['count']:>8g}")
+    return "\n".join(lines)
@@ -0,0 +1,232 @@
+import logging
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from app.config import RAW_DIR, CACHE_ENABLED, DOWNLOAD_WORKERS, EXTRACT_WORKERS, PIPELINE_QUEUE_SIZE
+from app.ingestion.downloader import download_concurrent
+from app.extraction.extractor import extract_text
+from app.extraction.ocr import limit_ocr_workers
+from app.ingestion.download_cache import DownloadCache
+from app.ingestion.manifest import Manifest
+from app.metrics import merge, run_collecting
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+class ExtractPool:
+    """A spawn process pool for extraction that replaces itself when a worker dies.
+
+    Every document in flight when a worker dies sees the pool break, so each is retried alone
+    in a one-worker pool; only a document that kills its worker again fails.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._retry_lock = threading.Lock()
+        self._executor = self._new_executor(workers)
+
+    @staticmethod
+    def _new_executor(workers: int) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            # Each worker already handles one document; nested OCR pools would start workers x OCR_WORKERS processes
+            initializer=limit_ocr_workers,
+        )
+
+    def _replace(self, broken: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is broken:
+                logger.warning("An extraction worker died, restarting the pool")
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._new_executor(self.workers)
+
+    def run(self, func: Callable, *args):
+        executor = self._executor
+        try:
+            return executor.submit(func, *args).result()
+        except BrokenProcessPool:
+            self._replace(executor)
+        with self._retry_lock, self._new_executor(1) as isolated:
+            return isolated.submit(func, *args).result()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._executor.shutdown()
+
+
+class Stage:
+    """Runs `func` over items from `inbox` on `workers` threads, forwarding non-None results to `outbox`."""
+
+    def __init__(self, name: str, func: Callable, inbox: queue.Queue, outbox: queue.Queue | None, workers: int):
+        self.name = name
+        self.func = func
+        self.inbox = inbox
+        self.outbox = outbox
+        self.workers = max(1, workers)
+        self.downstream_workers = 1
+        self._threads = []
+
+    def start(self) -> None:
+        self._threads = [
+            threading.Thread(target=self._work, name=f"{self.name}-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+        threading.Thread(target=self._close, name=f"{self.name}-closer", daemon=True).start()
+
+    def join(self) -> None:
+        for thread in self._threads:
+            thread.join()
+
+    def _work(self) -> None:
+        while True:
+            item = self.inbox.get()
+            if item is _DONE:
+                return
+            try:
+                output = self.func(item)
+            except Exception as e:
+                logger.error(f"{self.name} stage failed: {e}")
+                continue
+            if output is not None and self.outbox is not None:
+                self.outbox.put(output)
+
+    def _close(self) -> None:
+        self.join()
+        if self.outbox is not None:
+            for _ in range(self.downstream_workers):
+                self.outbox.put(_DONE)
+
+
+def run_pipeline(
+    items: Iterable[dict],
+    sinks: list[Callable[[dict], None]],
+    download_workers: int = DOWNLOAD_WORKERS,
+    extract_workers: int = EXTRACT_WORKERS,
+    queue_size: int = PIPELINE_QUEUE_SIZE,
+    use_cache: bool = CACHE_ENABLED,
+    manifest: Manifest | None = None,
+    download_cache: DownloadCache | None = None,
+) -> tuple[int, int]:
+    """Stream work items through download -> extract -> export stages connected by bounded queues.
+
+    Each item is a dict with "source_type", "source_url" and "pdf_url", plus "file_path" for
+    local files, which skip the download stage. Returns (processed, successful) counts.
+    """
+    extract_q = queue.Queue(maxsize=queue_size)
+    export_q = queue.Queue(maxsize=queue_size)
+    counts = {"processed": 0, "successful": 0}
+    # URL -> items waiting on its download, and the outcome of URLs already downloaded
+    waiting_items = {}
+    downloaded = {}
+
+    with ExtractPool(extract_workers) as pool:
+
+        def download_urls() -> Iterator[str]:
+            """Route items that need no download straight to extraction; yield the URLs to fetch."""
+            for item in items:
+                if item.get("file_path"):
+                    extract_q.put(item)
+                    continue
+
+                url = item["pdf_url"]
+                if url in waiting_items:
+                    waiting_items[url].append(item)
+                    continue
+                if url in downloaded:
+                    if downloaded[url]:
+                        extract_q.put({**item, **downloaded[url]})
+                    continue
+                if manifest:
+                    # With the download cache, completed URLs are still revalidated; a 304 costs next to nothing
+                    stored = None if download_cache else manifest.completed_result(url)
+                    if stored:
+                        logger.info(f"Already extracted: {url}")
+                        extract_q.put({**item, "result": stored})
+                        continue
+                    manifest.discard_unverified(url, RAW_DIR)
+
+                waiting_items[url] = [item]
+                yield url
+
+        def extract(item: dict) -> dict:
+            if "result" in item:
+                # Copied, since repeated URLs share one stored result and each gets its own source fields
+                result = {**item["result"]}
+            else:
+                file_path = Path(item["file_path"])
+                try:
+                    result, snapshot = pool.run(run_collecting, extract_text, file_path, use_cache)
+                except BrokenProcessPool as e:
+                    # Still exported, so the document is counted; not recorded, so --incremental retries it
+                    logger.error(f"Extraction worker died on {file_path.name}: {e}")
+                    result = {
+                        "file_name": file_path.name,
+                        "page_count": None,
+                        "extraction_method": None,
+                        "extracted_text": None,
+                        "success": False,
+                        "error": str(e),
+                    }
+                else:
+                    merge(snapshot)
+                    if manifest and item.get("content_hash"):
+                        manifest.record_extraction(item["pdf_url"], item["content_hash"], result)
+            result["source_type"] = item["source_type"]
+            result["source_url"] = item["source_url"]
+            result["pdf_url"] = item["pdf_url"]
+            return result
+
+        def export(record: dict) -> None:
+            for sink in sinks:
+                sink(record)
+            counts["processed"] += 1
+            counts["successful"] += bool(record.get("success"))
+
+        stages = [
+            Stage("extract", extract, extract_q, export_q, extract_workers),
+            Stage("export", export, export_q, None, 1),
+        ]
+        for stage, downstream in zip(stages, stages[1:]):
+            stage.downstream_workers = downstream.workers
+        for stage in stages:
+            stage.start()
+
+        # download_concurrent holds back URLs for busy hosts itself, so no download thread waits on a host
+        try:
+            for url, file_path in download_concurrent(download_urls(), workers=download_workers, cache=download_cache):
+                content_hash = manifest.record_download(url, file_path) if manifest else None
+                # record_download forgets the stored result when the content changed
+                stored = manifest.completed_result(url) if manifest else None
+                if stored:
+                    if file_path:
+                        logger.info(f"Unchanged since it was extracted: {url}")
+                    else:
+                        logger.warning(f"Download failed, reusing the last result: {url}")
+                    downloaded[url] = {"result": stored}
+                elif file_path:
+                    downloaded[url] = {"file_path": file_path, "content_hash": content_hash}
+                else:
+                    downloaded[url] = None
+                for item in waiting_items.pop(url):
+                    if downloaded[url]:
+                        extract_q.put({**item, **downloaded[url]})
+        finally:
+            for _ in range(stages[0].workers):
+                extract_q.put(_DONE)
+
+        stages[-1].join()
+
+    return counts["processed"], counts["successful"]
@@ -0,0 +1,112 @@
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+import httpx
+
+from benchmarks.fixtures import make_scanned_pdf
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(latencies: list[float]) -> dict:
+    ms = [value * 1000 for value in latencies]
+    return {
+        "requests": len(ms),
+        "p50_ms": round(statistics.median(ms), 1),
+        "p95_ms": round(percentile(ms, 95), 1),
+        "p99_ms": round(percentile(ms, 99), 1),
+        "max_ms": round(max(ms), 1),
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_up(client: httpx.AsyncClient, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("API server did not start")
+
+
+async def small_requests(client: httpx.AsyncClient, count: int, concurrency: int) -> list[float]:
+    limit = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(index: int) -> None:
+        async with limit:
+            start = time.perf_counter()
+            resp = await client.post("/extract/file", files={"file": (f"note_{index}.txt", f"Small document {index}\n".encode())})
+            resp.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(i) for i in range(count)))
+    return latencies
+
+
+async def run(base_url: str, pdf_path: Path, count: int, concurrency: int) -> dict:
+    async with httpx.AsyncClient(base_url=base_url, timeout=None) as client:
+        await wait_until_up(client)
+        baseline = await small_requests(client, count, concurrency)
+
+        large_started = time.perf_counter()
+        large = asyncio.create_task(
+            client.post("/extract/file", files={"file": (pdf_path.name, pdf_path.read_bytes(), "application/pdf")})
+        )
+        await asyncio.sleep(0.5)
+        under_load = await small_requests(client, count, concurrency)
+        await large
+        return {
+            "baseline": summarize(baseline),
+            "during_large_pdf": summarize(under_load),
+            "large_pdf_seconds": round(time.perf_counter() - large_started, 2),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency of small .txt uploads while a large scanned PDF is extracted")
+    parser.add_argument("--pdf", help="Large PDF to upload (default: synthetic scanned PDF)")
+    parser.add_argument("--pages", type=int, default=100, help="Pages in the synthetic PDF")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    port = free_port()
+    env = dict(os.environ, CACHE_ENABLED="false")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf_path = Path(args.pdf) if args.pdf else make_scanned_pdf(Path(tmp) / "large_scan.pdf", args.pages)
+            report = asyncio.run(run(f"http://127.0.0.1:{port}", pdf_path, args.requests, args.concurrency))
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
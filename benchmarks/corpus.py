@@ -0,0 +1,114 @@
+import argparse
+import json
+import random
+from pathlib import Path
+from docx import Document
+
+from benchmarks.fixtures import make_mixed_pdf, make_page_image, make_scanned_pdf, make_sentence, make_text_pdf
+
+ACCENTED = ["café", "naïve", "Zürich", "façade", "señor", "Ångström"]
+CP1252_ONLY = ["“quoted”", "–", "€"]
+NON_LATIN = ["東京", "Αθήνα", "Москва"]
+
+TXT_ENCODINGS = {
+    "utf-8": ACCENTED + CP1252_ONLY + NON_LATIN,
+    "utf-8-sig": ACCENTED + CP1252_ONLY + NON_LATIN,
+    "utf-16": ACCENTED + CP1252_ONLY + NON_LATIN,
+    "latin-1": ACCENTED,
+    "cp1252": ACCENTED + CP1252_ONLY,
+}
+
+
+def make_docx(path: Path, paragraphs: int, tables: int, rows: int, seed: int = 0) -> Path:
+    rng = random.Random(seed)
+    doc = Document()
+    doc.add_heading("Synthetic fixture", level=1)
+    per_table = max(1, paragraphs // max(1, tables))
+    for index in range(paragraphs):
+        doc.add_paragraph(make_sentence(rng, words=20))
+        if tables and index % per_table == per_table - 1 and len(doc.tables) < tables:
+            table = doc.add_table(rows=rows, cols=5)
+            for row in table.rows:
+                for cell in row.cells:
+                    cell.text = make_sentence(rng, words=3)
+            # Merged header cells exercise the duplicate-cell handling of extractors
+            table.cell(0, 0).merge(table.cell(0, 1))
+    doc.save(path)
+    return path
+
+
+def make_txt(path: Path, encoding: str, lines: int, seed: int = 0) -> Path:
+    rng = random.Random(seed)
+    extras = TXT_ENCODINGS[encoding]
+    text = "\n".join(f"{make_sentence(rng)} {rng.choice(extras)}" for _ in range(lines))
+    path.write_bytes(text.encode(encoding))
+    return path
+
+
+def make_images(output_dir: Path, count: int, frames: int, seed: int = 0) -> list[tuple[Path, int]]:
+    rng = random.Random(seed)
+    images = []
+    for index in range(count):
+        page = make_page_image([make_sentence(rng) for _ in range(30)])
+        fmt = ["PNG", "JPEG"][index % 2]
+        path = output_dir / f"image_{index:03d}.{fmt.lower().replace('jpeg', 'jpg')}"
+        page.save(path, fmt)
+        images.append((path, 1))
+
+    pages = [make_page_image([make_sentence(rng) for _ in range(30)]).convert("1") for _ in range(frames)]
+    path = output_dir / "fax.tiff"
+    pages[0].save(path, save_all=True, append_images=pages[1:], compression="group4", dpi=(204, 196))
+    images.append((path, frames))
+    return images
+
+
+def generate_corpus(output_dir: Path, scale: int = 1, seed: int = 0) -> list[dict]:
+    """Write a reproducible fixture set under `output_dir` and return its manifest."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = []
+
+    def add(group: str, path: Path, pages: int) -> None:
+        manifest.append({"group": group, "path": str(path), "pages": pages, "bytes": path.stat().st_size})
+
+    for index in range(4 * scale):
+        pages = [1, 5, 20, 60][index % 4]
+        add("pdf_text", make_text_pdf(output_dir / f"text_{index:03d}.pdf", pages, seed=seed + index), pages)
+    for index in range(2 * scale):
+        pages = [2, 8][index % 2]
+        add("pdf_scanned", make_scanned_pdf(output_dir / f"scanned_{index:03d}.pdf", pages, seed=seed + index), pages)
+    for index in range(2 * scale):
+        add("pdf_mixed", make_mixed_pdf(output_dir / f"mixed_{index:03d}.pdf", 10, 3, seed=seed + index), 10)
+    for index in range(2 * scale):
+        path = make_docx(output_dir / f"doc_{index:03d}.docx", 400 * (index + 1), 8, 40, seed=seed + index)
+        add("docx", path, 1)
+    for index, encoding in enumerate(TXT_ENCODINGS):
+        for copy in range(scale):
+            path = make_txt(output_dir / f"txt_{encoding}_{copy:03d}.txt", encoding, 5000, seed=seed + index + copy)
+            add("txt", path, 1)
+    for path, pages in make_images(output_dir, 4 * scale, 12, seed=seed):
+        add("image", path, pages)
+
+    (output_dir / "corpus.json").write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+def load_corpus(output_dir: Path) -> list[dict]:
+    return json.loads((output_dir / "corpus.json").read_text())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the synthetic benchmark corpus")
+    parser.add_argument("--out", required=True, help="Directory to write fixtures into")
+    parser.add_argument("--scale", type=int, default=1, help="Multiplier on the number of files per group")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    manifest = generate_corpus(Path(args.out), args.scale, args.seed)
+    groups = {}
+    for item in manifest:
+        groups[item["group"]] = groups.get(item["group"], 0) + 1
+    print(json.dumps(groups, indent=2))
+
+
+if __name__ == "__main__":
+    main()
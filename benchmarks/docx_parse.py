@@ -0,0 +1,88 @@
+import argparse
+import hashlib
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from docx import Document
+
+from benchmarks.corpus import make_docx
+
+
+def legacy_parse(docx_path: Path) -> str:
+    doc = Document(str(docx_path))
+    paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
+    for table in doc.tables:
+        for row in table.rows:
+            row_text = [cell.text.strip() for cell in row.cells if cell.text.strip()]
+            if row_text:
+                paragraphs.append(" | ".join(row_text))
+    return "\n".join(paragraphs)
+
+
+def peak_rss_mb() -> float:
+    # VmHWM belongs to this process image; ru_maxrss would include the parent's peak from before the fork
+    for line in Path("/proc/self/status").read_text().splitlines():
+        if line.startswith("VmHWM:"):
+            return round(int(line.split()[1]) / 1024, 1)
+    return 0.0
+
+
+def run_child(docx_path: str, parser: str) -> None:
+    from app.extraction.docx_extractor import extract_text_from_docx
+
+    start = time.perf_counter()
+    if parser == "legacy":
+        text = legacy_parse(Path(docx_path))
+    else:
+        text = extract_text_from_docx(Path(docx_path), parser=parser)["extracted_text"] or ""
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        "seconds": round(elapsed, 3),
+        "peak_rss_mb": peak_rss_mb(),
+        "sha256": hashlib.sha256(text.encode()).hexdigest(),
+    }))
+
+
+def measure(docx_path: Path, parser: str) -> dict:
+    cmd = [sys.executable, "-m", "benchmarks.docx_parse", "--child", parser, "--docx", str(docx_path)]
+    out = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time, peak memory and output of python-docx vs streaming DOCX parsing")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 40000], help="Paragraphs per fixture")
+    parser.add_argument("--rows", type=int, default=40, help="Rows per table; one table per 200 paragraphs")
+    parser.add_argument("--child", choices=["legacy", "python-docx", "stream"], help=argparse.SUPPRESS)
+    parser.add_argument("--docx", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.docx, args.child)
+        return
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for index, paragraphs in enumerate(args.sizes):
+            docx_path = make_docx(Path(tmp) / f"doc_{paragraphs}.docx", paragraphs, paragraphs // 200, args.rows, seed=index)
+            runs = {name: measure(docx_path, name) for name in ["legacy", "python-docx", "stream"]}
+            results.append({
+                "paragraphs": paragraphs,
+                "file_mb": round(docx_path.stat().st_size / 1024 / 1024, 2),
+                **{f"{name}_s": run["seconds"] for name, run in runs.items()},
+                **{f"{name}_peak_rss_mb": run["peak_rss_mb"] for name, run in runs.items()},
+                "speedup": round(runs["legacy"]["seconds"] / runs["stream"]["seconds"], 1) if runs["stream"]["seconds"] else None,
+                # Reading order and merged-cell dedupe differ from the legacy output, so equivalence is checked
+                # against python-docx walking the same blocks in the same order
+                "identical_output": runs["python-docx"]["sha256"] == runs["stream"]["sha256"],
+            })
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import argparse
+import csv
+import json
+import random
+import sys
+import time
+
+from app.export.exporter import export_to_csv, export_to_json, export_to_parquet, JSONLStreamWriter
+from benchmarks.fixtures import make_sentence
+
+
+def make_records(count: int, pages: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    records = []
+    for index in range(count):
+        page_texts = [" ".join(make_sentence(rng) for _ in range(6)) for _ in range(pages)]
+        text = "\n\n".join(page_texts)
+        spans, offset = [], 0
+        for number, page_text in enumerate(page_texts, start=1):
+            spans.append({"page_number": number, "extraction_method": "pdfminer", "start": offset, "end": offset + len(page_text)})
+            offset += len(page_text) + 2
+        records.append({
+            "source_type": "url",
+            "source_url": f"https://example.com/docs/{index}.pdf",
+            "pdf_url": f"https://example.com/docs/{index}.pdf",
+            "file_name": f"{index}.pdf",
+            "page_count": pages,
+            "extraction_method": "pdfminer",
+            "extracted_text": text,
+            "pages": spans,
+            "success": True,
+        })
+    return records
+
+
+def export_jsonl(records: list[dict], filename: str):
+    with JSONLStreamWriter(filename) as writer:
+        for record in records:
+            writer.write(record)
+    return writer.path
+
+
+def read_csv(path):
+    csv.field_size_limit(sys.maxsize)
+    with open(path, newline="", encoding="utf-8") as f:
+        return sum(1 for _ in csv.DictReader(f))
+
+
+def read_json(path):
+    with open(path, encoding="utf-8") as f:
+        return len(json.load(f))
+
+
+def read_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        return sum(1 for line in f if json.loads(line))
+
+
+def read_parquet(path):
+    import pyarrow.parquet as pq
+
+    return pq.read_table(path).num_rows
+
+
+FORMATS = {
+    "csv": (export_to_csv, read_csv),
+    "json": (export_to_json, read_json),
+    "jsonl": (export_jsonl, read_jsonl),
+    "parquet": (export_to_parquet, read_parquet),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write time, file size and reload time per export format")
+    parser.add_argument("--records", type=int, default=50_000)
+    parser.add_argument("--pages", type=int, default=3, help="Pages per synthetic record")
+    parser.add_argument("--formats", nargs="+", choices=list(FORMATS), default=list(FORMATS))
+    args = parser.parse_args()
+
+    records = make_records(args.records, args.pages)
+    results = []
+    for fmt in args.formats:
+        export, reload = FORMATS[fmt]
+        start = time.perf_counter()
+        path = export(records, f"benchmark_export.{fmt}")
+        write_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        rows = reload(path)
+        reload_s = time.perf_counter() - start
+
+        results.append({
+            "format": fmt,
+            "records": rows,
+            "write_s": round(write_s, 2),
+            "size_mb": round(path.stat().st_size / 1024 / 1024, 1),
+            "reload_s": round(reload_s, 2),
+        })
+        path.unlink()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
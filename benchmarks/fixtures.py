@@ -0,0 +1,115 @@
+import random
+import zlib
+from pathlib import Path
+from PIL import Image, ImageDraw
+
+WORDS = (
+    "invoice statement quarterly revenue filing schedule annex contract party "
+    "agreement total amount payable balance report summary section clause"
+).split()
+
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+
+
+def make_sentence(rng: random.Random, words: int = 12) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def make_page_image(text_lines: list[str], size: tuple[int, int] = (850, 1100)) -> Image.Image:
+    image = Image.new("L", size, color=255)
+    draw = ImageDraw.Draw(image)
+    y = 40
+    for line in text_lines:
+        draw.text((40, y), line, fill=0)
+        y += 18
+    return image
+
+
+def _text_stream(lines: list[str]) -> bytes:
+    ops = ["BT", "/F1 10 Tf", "14 TL", f"50 {PAGE_HEIGHT - 60} Td"]
+    for line in lines:
+        escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+        ops.append(f"({escaped}) Tj T*")
+    ops.append("ET")
+    return "\n".join(ops).encode("latin-1")
+
+
+def write_pdf(path: Path, pages: list[tuple[str, object]], title: str = "Synthetic fixture") -> Path:
+    """Write a minimal PDF where each page is ("text", lines) or ("image", PIL image)."""
+    objects = [None, None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_refs = []
+
+    for kind, content in pages:
+        if kind == "text":
+            stream = _text_stream(content)
+            resources = "<< /Font << /F1 3 0 R >> >>"
+        else:
+            image = content.convert("L")
+            data = zlib.compress(image.tobytes())
+            objects.append(
+                f"<< /Type /XObject /Subtype /Image /Width {image.width} /Height {image.height} "
+                f"/ColorSpace /DeviceGray /BitsPerComponent 8 /Filter /FlateDecode /Length {len(data)} >>\n".encode()
+                + b"stream\n" + data + b"\nendstream"
+            )
+            stream = f"q {PAGE_WIDTH} 0 0 {PAGE_HEIGHT} 0 0 cm /Im1 Do Q".encode()
+            resources = f"<< /XObject << /Im1 {len(objects)} 0 R >> >>"
+
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream")
+        content_ref = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources {resources} /Contents {content_ref} 0 R >>".encode()
+        )
+        page_refs.append(len(objects))
+
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    kids = " ".join(f"{ref} 0 R" for ref in page_refs)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_refs)} >>".encode()
+    objects.append(f"<< /Title ({title}) /Producer (benchmarks.fixtures) >>".encode())
+    info_ref = len(objects)
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+
+    xref_offset = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R /Info {info_ref} 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+
+    path.write_bytes(bytes(out))
+    return path
+
+
+def make_text_pdf(path: Path, pages: int, seed: int = 0, lines_per_page: int = 40) -> Path:
+    rng = random.Random(seed)
+    return write_pdf(path, [
+        ("text", [make_sentence(rng) for _ in range(lines_per_page)])
+        for _ in range(pages)
+    ])
+
+
+def make_mixed_pdf(path: Path, pages: int, scanned_pages: int, seed: int = 0) -> Path:
+    rng = random.Random(seed)
+    scanned = set(rng.sample(range(pages), min(scanned_pages, pages)))
+    return write_pdf(path, [
+        ("image", make_page_image([make_sentence(rng) for _ in range(40)]))
+        if index in scanned
+        else ("text", [make_sentence(rng) for _ in range(40)])
+        for index in range(pages)
+    ])
+
+
+def make_scanned_pdf(path: Path, pages: int, seed: int = 0, resolution: float = 100.0) -> Path:
+    rng = random.Random(seed)
+    page_images = [
+        make_page_image([make_sentence(rng) for _ in range(40)])
+        for _ in range(min(pages, 10))
+    ]
+    first, rest = page_images[0], [page_images[i % len(page_images)] for i in range(1, pages)]
+    first.save(path, "PDF", resolution=resolution, save_all=True, append_images=rest)
+    return path
@@ -0,0 +1,62 @@
+import argparse
+import importlib.util
+import json
+import random
+import time
+import pytesseract
+
+from app.extraction.ocr_engine import TesseractCLIEngine, TesserocrEngine
+from benchmarks.fixtures import make_page_image, make_sentence
+
+
+def make_receipts(count: int) -> list:
+    rng = random.Random(0)
+    return [
+        make_page_image([make_sentence(rng, words=5) for _ in range(8)], size=(480, 220))
+        for _ in range(count)
+    ]
+
+
+def per_image_subprocess(images: list, batch_size: int) -> None:
+    for image in images:
+        pytesseract.image_to_string(image)
+
+
+def batched(engine):
+    def run(images: list, batch_size: int) -> None:
+        for start in range(0, len(images), batch_size):
+            engine.recognize_batch(images[start:start + batch_size])
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Images per second: one tesseract process per image vs the OCR engine layer")
+    parser.add_argument("--images", type=int, default=50, help="Number of small receipt-sized images")
+    parser.add_argument("--batch-size", type=int, default=16, help="Images per tesseract invocation in batched CLI mode")
+    args = parser.parse_args()
+
+    images = make_receipts(args.images)
+    variants = {
+        "pytesseract per image": per_image_subprocess,
+        "tesseract CLI batched": batched(TesseractCLIEngine()),
+    }
+    if importlib.util.find_spec("tesserocr"):
+        variants["tesserocr persistent"] = batched(TesserocrEngine())
+
+    results = []
+    for name, run in variants.items():
+        start = time.perf_counter()
+        run(images, args.batch_size)
+        elapsed = time.perf_counter() - start
+        results.append({
+            "engine": name,
+            "images": args.images,
+            "seconds": round(elapsed, 2),
+            "images_per_second": round(args.images / elapsed, 1),
+        })
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
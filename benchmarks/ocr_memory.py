@@ -0,0 +1,70 @@
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.fixtures import make_scanned_pdf
+
+
+def run_child(pdf_path: str, mode: str, run_ocr: bool) -> None:
+    import pytesseract
+    from pdf2image import convert_from_path
+    from app.extraction import ocr
+
+    if not run_ocr:
+        pytesseract.image_to_string = lambda image: ""
+        ocr.ocr_images = lambda images: [""] * len(images)
+
+    if mode == "full":
+        images = convert_from_path(pdf_path, dpi=ocr.OCR_DPI)
+        for image in images:
+            pytesseract.image_to_string(image)
+    else:
+        ocr.extract_text_ocr(Path(pdf_path), workers=1)
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"peak_rss_mb": round(peak_kb / 1024, 1)}))
+
+
+def measure(pdf_path: Path, mode: str, window: int, run_ocr: bool) -> dict:
+    env = dict(os.environ, OCR_WINDOW_SIZE=str(window))
+    cmd = [sys.executable, "-m", "benchmarks.ocr_memory", "--child", mode, "--pdf", str(pdf_path)]
+    if run_ocr:
+        cmd.append("--ocr")
+    out = subprocess.run(cmd, env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak memory of full vs streaming OCR rasterization")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--windows", type=int, nargs="+", default=[1, 2, 8])
+    parser.add_argument("--ocr", action="store_true", help="Run Tesseract as well as rasterization")
+    parser.add_argument("--child", choices=["full", "stream"], help=argparse.SUPPRESS)
+    parser.add_argument("--pdf", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.pdf, args.child, args.ocr)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = make_scanned_pdf(Path(tmp) / "synthetic.pdf", args.pages)
+        results = [{"mode": "full", "pages": args.pages, **measure(pdf_path, "full", 0, args.ocr)}]
+        for window in args.windows:
+            results.append({
+                "mode": "stream",
+                "window": window,
+                "pages": args.pages,
+                **measure(pdf_path, "stream", window, args.ocr),
+            })
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
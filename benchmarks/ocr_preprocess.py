@@ -0,0 +1,84 @@
+import argparse
+import difflib
+import json
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
+
+from app.extraction.ocr_engine import ocr_image
+from app.extraction.preprocess import preprocess_image
+from benchmarks.fixtures import make_sentence
+
+
+def make_photo(path: Path, lines: list[str], size: tuple[int, int], seed: int) -> Path:
+    """Render a page as a phone camera would capture it: large, off-white, slightly noisy JPEG."""
+    rng = random.Random(seed)
+    image = Image.new("RGB", size, color=(228, 224, 214))
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default(size=size[0] // 45)
+    y = size[1] // 12
+    for line in lines:
+        draw.text((size[0] // 12, y), line, fill=(40, 40, 48), font=font)
+        y += int(font.size * 1.6)
+
+    noise = Image.effect_noise(size, 24).convert("RGB")
+    image = Image.blend(image, noise, 0.08).filter(ImageFilter.GaussianBlur(1))
+    image.save(path, "JPEG", quality=rng.randint(80, 92))
+    return path
+
+
+def char_accuracy(expected: str, actual: str) -> float:
+    expected, actual = " ".join(expected.split()), " ".join(actual.split())
+    return difflib.SequenceMatcher(None, expected, actual, autojunk=False).ratio()
+
+
+def run_variant(fixtures: list[tuple[Path, str]], prepare) -> dict:
+    timings = []
+    accuracies = []
+    for path, expected in fixtures:
+        start = time.perf_counter()
+        with Image.open(path) as image:
+            text = ocr_image(prepare(image))
+        timings.append(time.perf_counter() - start)
+        accuracies.append(char_accuracy(expected, text))
+    return {
+        "median_seconds": round(statistics.median(timings), 3),
+        "total_seconds": round(sum(timings), 2),
+        "char_accuracy": round(statistics.mean(accuracies), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OCR time and character accuracy with and without preprocessing")
+    parser.add_argument("--images", type=int, default=5)
+    parser.add_argument("--width", type=int, default=3024, help="Fixture width in pixels (default: 12 MP phone photo)")
+    parser.add_argument("--height", type=int, default=4032)
+    args = parser.parse_args()
+
+    variants = {
+        "raw": lambda image: image,
+        "grayscale+downscale": lambda image: preprocess_image(image, binarize_image=False),
+        "grayscale+downscale+binarize": lambda image: preprocess_image(image, binarize_image=True),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = []
+        for seed in range(args.images):
+            rng = random.Random(seed)
+            lines = [make_sentence(rng, words=8) for _ in range(24)]
+            path = make_photo(Path(tmp) / f"photo_{seed}.jpg", lines, (args.width, args.height), seed)
+            fixtures.append((path, "\n".join(lines)))
+
+        results = [
+            {"variant": name, "images": args.images, **run_variant(fixtures, prepare)}
+            for name, prepare in variants.items()
+        ]
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from pdfminer.high_level import extract_text
+from pdfminer.pdfpage import PDFPage
+
+from app.extraction.text_extractor import parse_pdf
+from benchmarks.fixtures import make_text_pdf
+
+
+def legacy_parse(pdf_path: Path) -> tuple[int, str]:
+    with open(pdf_path, "rb") as f:
+        page_count = sum(1 for _ in PDFPage.get_pages(f))
+    return page_count, extract_text(str(pdf_path))
+
+
+def single_pass_parse(pdf_path: Path) -> tuple[int, str]:
+    pages, _ = parse_pdf(pdf_path)
+    return len(pages), "\n\n".join(pages)
+
+
+def time_call(func, pdf_path: Path, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(pdf_path)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse time of the legacy two-pass PDF read vs single-pass parse_pdf")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 50, 200], help="Page counts of the fixture corpus")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for index, pages in enumerate(args.sizes):
+            pdf_path = make_text_pdf(Path(tmp) / f"text_{pages}.pdf", pages, seed=index)
+            legacy = time_call(legacy_parse, pdf_path, args.repeat)
+            single = time_call(single_pass_parse, pdf_path, args.repeat)
+            results.append({
+                "pages": pages,
+                "legacy_ms": round(legacy * 1000, 1),
+                "single_pass_ms": round(single * 1000, 1),
+                "saved_ms": round((legacy - single) * 1000, 1),
+                "speedup": round(legacy / single, 2) if single else None,
+            })
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.api_load import percentile
+from benchmarks.corpus import generate_corpus, load_corpus
+
+EXTRACT_GROUPS = ["pdf_text", "pdf_scanned", "pdf_mixed", "docx", "txt", "image"]
+EXPORT_FORMATS = ["json", "jsonl", "csv", "parquet"]
+
+# Metrics where a larger value is an improvement; everything else compared is lower-is-better
+HIGHER_IS_BETTER = {"docs_per_second", "pages_per_second", "records_per_second"}
+COMPARED = ["docs_per_second", "pages_per_second", "records_per_second", "p50_ms", "p95_ms", "p99_ms", "peak_rss_mb"]
+
+
+def peak_rss_mb() -> float:
+    # VmHWM belongs to this process image; ru_maxrss would include the parent's peak from before the fork
+    for line in Path("/proc/self/status").read_text().splitlines():
+        if line.startswith("VmHWM:"):
+            return round(int(line.split()[1]) / 1024, 1)
+    return 0.0
+
+
+def latency_summary(latencies: list[float]) -> dict:
+    ms = [value * 1000 for value in latencies]
+    if not ms:
+        return {}
+    return {
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+        "max_ms": round(max(ms), 3),
+    }
+
+
+def bench_extract(corpus_dir: Path, group: str, repeat: int) -> dict:
+    from app.extraction.extractor import extract_text
+
+    items = [item for item in load_corpus(corpus_dir) if item["group"] == group]
+    latencies = []
+    pages = successful = 0
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in items:
+            item_start = time.perf_counter()
+            result = extract_text(Path(item["path"]), use_cache=False)
+            latencies.append(time.perf_counter() - item_start)
+            pages += result.get("page_count") or 0
+            successful += bool(result.get("success"))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "documents": len(latencies),
+        "successful": successful,
+        "pages": pages,
+        "seconds": round(elapsed, 3),
+        "docs_per_second": round(len(latencies) / elapsed, 2),
+        "pages_per_second": round(pages / elapsed, 2),
+        **latency_summary(latencies),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def bench_export(fmt: str, records: int, pages: int) -> dict:
+    from app.export.exporter import STREAM_WRITERS
+    from benchmarks.export_formats import make_records
+
+    batch = make_records(records, pages)
+    latencies = []
+
+    start = time.perf_counter()
+    with STREAM_WRITERS[fmt](f"benchmark_{os.getpid()}") as writer:
+        for record in batch:
+            record_start = time.perf_counter()
+            writer.write(record)
+            latencies.append(time.perf_counter() - record_start)
+    elapsed = time.perf_counter() - start
+
+    size = sum(path.stat().st_size for path in writer.paths)
+    for path in writer.paths:
+        path.unlink(missing_ok=True)
+
+    return {
+        "records": len(batch),
+        "seconds": round(elapsed, 3),
+        "records_per_second": round(len(batch) / elapsed, 1),
+        "output_mb": round(size / 1024 / 1024, 2),
+        **latency_summary(latencies),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_child(name: str, args: argparse.Namespace) -> dict:
+    """Run one benchmark in a fresh interpreter so peak RSS belongs to that benchmark alone."""
+    cmd = [sys.executable, "-m", "benchmarks.suite", "--child", name, "--corpus", str(args.corpus),
+           "--repeat", str(args.repeat), "--records", str(args.records)]
+    out = subprocess.run(cmd, capture_output=True, text=True)
+    if out.returncode != 0:
+        return {"error": out.stderr.strip().splitlines()[-1] if out.stderr.strip() else f"exit {out.returncode}"}
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: dict, current: dict) -> list[dict]:
+    rows = []
+    for name, metrics in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not before:
+            continue
+        for metric in COMPARED:
+            if metric not in metrics or not before.get(metric):
+                continue
+            change = (metrics[metric] - before[metric]) / before[metric] * 100
+            better = change > 0 if metric in HIGHER_IS_BETTER else change < 0
+            rows.append({
+                "benchmark": name,
+                "metric": metric,
+                "baseline": before[metric],
+                "current": metrics[metric],
+                "change_pct": round(change, 1),
+                "verdict": "same" if abs(change) < 5 else ("better" if better else "worse"),
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput, latency and peak memory of every extractor and exporter")
+    parser.add_argument("--corpus", type=Path, help="Corpus directory; generated into a temp directory when omitted")
+    parser.add_argument("--scale", type=int, default=1, help="Corpus size multiplier when generating")
+    parser.add_argument("--repeat", type=int, default=1, help="Passes over each extraction group")
+    parser.add_argument("--records", type=int, default=2000, help="Records written per exporter")
+    parser.add_argument("--only", nargs="+", help="Benchmarks to run, e.g. pdf_text export_csv")
+    parser.add_argument("--output", type=Path, help="Write the JSON report here as well as to stdout")
+    parser.add_argument("--compare", type=Path, help="Earlier JSON report to compare against")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        if args.child.startswith("export_"):
+            result = bench_export(args.child.removeprefix("export_"), args.records, pages=5)
+        else:
+            result = bench_extract(args.corpus, args.child, args.repeat)
+        print(json.dumps(result))
+        return
+
+    names = EXTRACT_GROUPS + [f"export_{fmt}" for fmt in EXPORT_FORMATS]
+    if args.only:
+        names = [name for name in names if name in args.only]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if not args.corpus:
+            args.corpus = Path(tmp) / "corpus"
+            generate_corpus(args.corpus, args.scale)
+
+        report = {
+            "meta": {
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "commit": git_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "scale": args.scale,
+                "repeat": args.repeat,
+            },
+            "results": {name: run_child(name, args) for name in names},
+        }
+
+    if args.compare:
+        report["comparison"] = compare(json.loads(args.compare.read_text()), report)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
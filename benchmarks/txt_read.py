@@ -0,0 +1,116 @@
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.suite import peak_rss_mb
+
+LINE = "2024-01-01 12:00:00 INFO worker-3 processed request id=8f2c café\n"
+LEGACY_ENCODINGS = ["utf-8", "latin-1", "cp1252"]
+# Short prefixes are where statistical detection goes wrong, so most of these are a single line
+ENCODING_SAMPLES = [
+    ("line 1 café €\n", "cp1252"),
+    ("é è à ç ô\n", "cp1252"),
+    ("é è à ç ô\n", "latin-1"),
+    ("2024-01-01 12:00:00 WARN user=jürgen paid 12€ for crème brûlée\n", "cp1252"),
+    ("Le cœur de l'été, «déjà vu» — naïve façade\n", "cp1252"),
+    ("Größe Übermaß Fußgängerübergänge\n", "latin-1"),
+    ("Ошибка подключения к базе данных\n", "cp1251"),
+    ("Привет, мир! Это тестовая строка на русском языке.\n" * 3, "koi8_r"),
+    ("Καλημέρα κόσμε, αυτό είναι ένα δοκιμαστικό κείμενο.\n", "cp1253"),
+    ("שלום עולם, זהו טקסט לבדיקה בעברית\n" * 2, "cp1255"),
+    ("こんにちは世界、これはテストです。\n" * 3, "shift_jis"),
+    ("café “quoted” naïve\n", "utf-8"),
+    ("café “quoted” naïve\n", "utf-16"),
+]
+
+
+def make_log(path: Path, megabytes: int) -> Path:
+    """A UTF-8 log whose second half is cp1252, so strict UTF-8 decoding fails halfway."""
+    half = LINE * (megabytes * 1024 * 1024 // 2 // len(LINE.encode()))
+    with open(path, "wb") as f:
+        f.write(half.encode("utf-8"))
+        f.write(half.replace("café", "“café”").encode("cp1252"))
+    return path
+
+
+def legacy_read(path: Path) -> str:
+    for encoding in LEGACY_ENCODINGS:
+        try:
+            with open(path, "r", encoding=encoding) as f:
+                return f.read().strip()
+        except UnicodeDecodeError:
+            continue
+    return ""
+
+
+def run_child(path: str, mode: str) -> None:
+    from app.extraction.txt_extractor import extract_text_from_txt, iter_txt_pages
+
+    start = time.perf_counter()
+    if mode == "legacy":
+        chars = len(legacy_read(Path(path)))
+    elif mode == "pages":
+        chars = sum(len(page) for page in iter_txt_pages(Path(path)))
+    else:
+        chars = len(extract_text_from_txt(Path(path))["extracted_text"] or "")
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"seconds": round(elapsed, 3), "chars": chars, "peak_rss_mb": peak_rss_mb()}))
+
+
+def check_encodings(tmp: Path) -> list[dict]:
+    """Whether each sample comes back as the text that was written, and which encoding was detected."""
+    from app.extraction.txt_extractor import extract_text_from_txt, open_text
+
+    checks = []
+    for index, (text, encoding) in enumerate(ENCODING_SAMPLES):
+        path = tmp / f"sample_{index}.txt"
+        path.write_bytes(text.encode(encoding))
+        detected, _ = open_text(path)
+        extracted = extract_text_from_txt(path)["extracted_text"]
+        checks.append({
+            "encoding": encoding,
+            "detected": detected,
+            "correct": extracted == text.strip(),
+            "sample": text.splitlines()[0][:40],
+        })
+        path.unlink()
+    return checks
+
+
+def measure(path: Path, mode: str) -> dict:
+    cmd = [sys.executable, "-m", "benchmarks.txt_read", "--child", mode, "--path", str(path)]
+    out = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time and peak memory of the legacy TXT read vs sniffed, chunked decoding, and decode correctness"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 128, 512], help="File sizes in MB")
+    parser.add_argument("--child", choices=["legacy", "extract", "pages"], help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.path, args.child)
+        return
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        encodings = check_encodings(Path(tmp))
+        for megabytes in args.sizes:
+            path = make_log(Path(tmp) / f"log_{megabytes}.txt", megabytes)
+            for mode in ["legacy", "extract", "pages"]:
+                results.append({"mb": megabytes, "mode": mode, **measure(path, mode)})
+            path.unlink()
+
+    print(json.dumps({"reads": results, "encodings": encodings}, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
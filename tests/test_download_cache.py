@@ -0,0 +1,92 @@
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.ingestion.download_cache import DownloadCache
+from app.ingestion.downloader import download_pdf
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves `server.documents` with ETags, answering If-None-Match with 304."""
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.get("If-None-Match")))
+        body = self.server.documents.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    httpd.documents = {}
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_port}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DownloadCache(tmp_path / "downloads.db")
+
+
+def test_unchanged_document_is_revalidated(server, cache, tmp_path):
+    server.documents["/a.pdf"] = b"%PDF-1.4 first"
+    url = f"{server.url}/a.pdf"
+
+    first = download_pdf(url, output_dir=tmp_path, cache=cache)
+    second = download_pdf(url, output_dir=tmp_path, cache=cache)
+
+    assert first == second == tmp_path / "a.pdf"
+    assert server.requests[0][1] is None
+    assert server.requests[1][1] is not None
+    assert first.read_bytes() == b"%PDF-1.4 first"
+
+
+def test_identical_content_from_mirrors_shares_one_file(server, cache, tmp_path):
+    server.documents["/a.pdf"] = server.documents["/mirror/b.pdf"] = b"%PDF-1.4 same"
+
+    first = download_pdf(f"{server.url}/a.pdf", output_dir=tmp_path, cache=cache)
+    second = download_pdf(f"{server.url}/mirror/b.pdf", output_dir=tmp_path, cache=cache)
+
+    assert first == second == tmp_path / "a.pdf"
+    assert not (tmp_path / "b.pdf").exists()
+
+
+def test_changed_document_does_not_leak_to_mirrors(server, cache, tmp_path):
+    server.documents["/a.pdf"] = server.documents["/mirror/b.pdf"] = b"%PDF-1.4 v1"
+    download_pdf(f"{server.url}/a.pdf", output_dir=tmp_path, cache=cache)
+    download_pdf(f"{server.url}/mirror/b.pdf", output_dir=tmp_path, cache=cache)
+
+    server.documents["/a.pdf"] = b"%PDF-1.4 v2"
+    updated = download_pdf(f"{server.url}/a.pdf", output_dir=tmp_path, cache=cache)
+    mirror = download_pdf(f"{server.url}/mirror/b.pdf", output_dir=tmp_path, cache=cache)
+
+    assert updated.read_bytes() == b"%PDF-1.4 v2"
+    assert mirror != updated
+    assert mirror.read_bytes() == b"%PDF-1.4 v1"
+
+    # The v1 content hash must not point at the overwritten file either
+    server.documents["/c.pdf"] = b"%PDF-1.4 v1"
+    third = download_pdf(f"{server.url}/c.pdf", output_dir=tmp_path, cache=cache)
+    assert third.read_bytes() == b"%PDF-1.4 v1"